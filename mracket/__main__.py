@@ -2,33 +2,72 @@ import argparse
 import json
 import logging
 import os
-import shutil
 import sys
 import traceback
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None  # type: ignore[assignment]
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 from mracket import runner
 from mracket.mutation import generator, mutator
 from mracket.runner import logger
 
+# json.dump writes many small chunks, buffer them so that they reach the file in few system calls
+OUTPUT_BUFFER_SIZE = 1 << 20
+
 
 def parse_arguments() -> argparse.Namespace:
     parser = build_parser()
     arguments = parser.parse_args()
     if arguments.output is None:
         arguments.output = os.path.join(
-            os.getcwd(), f"{os.path.splitext(os.path.basename(arguments.filepath))[0]}-analysis.json"
+            os.getcwd(),
+            f"{os.path.splitext(os.path.basename(arguments.filepath))[0]}-analysis.{arguments.format}",
         )
     if arguments.verbose:
         logger.LOGGER.setLevel(logging.DEBUG)
     return arguments
 
 
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be positive, got {number}")
+    return number
+
+
+def non_negative_int(value: str) -> int:
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be non-negative, got {number}")
+    return number
+
+
+def probability(value: str) -> float:
+    number = float(value)
+    if not 0 <= number <= 1:
+        raise argparse.ArgumentTypeError(f"must be between 0 and 1, got {number}")
+    return number
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser()
     parser.add_argument("filepath")
     parser.add_argument("-c", "--config", required=True)
     parser.add_argument("-o", "--output", default=None)
     parser.add_argument("-f", "--force", action="store_true", default=False)
+    parser.add_argument("--format", choices=["json", "msgpack"], default="json")
+    parser.add_argument("-j", "--jobs", type=positive_int, default=None)
+    parser.add_argument("--max-mutations", type=non_negative_int, default=None)
+    parser.add_argument("--sample-rate", type=probability, default=None)
+    parser.add_argument("--seed", type=int, default=None)
     parser.add_argument("-v", "--verbose", action="store_true", default=False)
     return parser
 
@@ -40,8 +79,9 @@ def check_preconditions(arguments: argparse.Namespace) -> None:
         raise FileNotFoundError(f"Config file not found: {arguments.config}")
     if not arguments.force and os.path.exists(arguments.output):
         raise FileExistsError(f"Output file already exists: {arguments.output}")
-    if shutil.which("racket") is None:
-        raise FileNotFoundError("Cannot find the Racket executable")
+    if arguments.format == "msgpack" and msgpack is None:
+        raise ModuleNotFoundError("The msgpack format requires the msgpack package")
+    runner.racket_executable()
 
 
 def build_mutator(arguments: argparse.Namespace) -> mutator.Mutator:
@@ -54,25 +94,52 @@ def build_mutator(arguments: argparse.Namespace) -> mutator.Mutator:
         elif generator_config["type"] == "procedure application replacement":
             generators.append(generator.ProcedureApplicationReplacement(generator_config["replacements"]))
         # TODO: raise an error
-    return mutator.Mutator(generators)
+    return mutator.Mutator(
+        generators,
+        max_mutations=arguments.max_mutations,
+        sample_rate=arguments.sample_rate,
+        seed=arguments.seed,
+    )
+
+
+def write_analysis(result_dict: dict, filepath: str, format_: str = "json") -> None:
+    """Write the analysis to a file.
+
+    If orjson is installed, the JSON analysis is serialized into a single bytes object before being written, which is
+    faster than json.dump but holds the whole serialized analysis in memory, rather than streaming it to the file
+    through a buffer of OUTPUT_BUFFER_SIZE bytes. Either way, the JSON analysis is written as the same UTF-8 bytes.
+
+    :param result_dict: The analysis
+    :param filepath: The path of the file to write
+    :param format_: The format of the file, either json or msgpack
+    """
+    if format_ == "msgpack":
+        with open(filepath, mode="wb") as f:
+            msgpack.pack(result_dict, f)
+    elif orjson is not None:
+        with open(filepath, mode="wb") as f:
+            f.write(orjson.dumps(result_dict, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filepath, mode="w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE) as f:
+            json.dump(result_dict, f, indent=2, ensure_ascii=False)
 
 
 def build_runner(arguments: argparse.Namespace, mutator_: mutator.Mutator) -> runner.Runner:
-    return runner.Runner(mutator_, arguments.filepath)
+    return runner.Runner(mutator_, arguments.filepath, arguments.jobs)
 
 
 if __name__ == "__main__":
+    # argparse exits on its own, with status 2 on a usage error
+    arguments = parse_arguments()
     try:
-        arguments = parse_arguments()
         check_preconditions(arguments)
         mutator_ = build_mutator(arguments)
         runner_ = build_runner(arguments, mutator_)
         runner_.run()
         result_dict = runner_.result.to_dict()
         logger.LOGGER.debug("Writing analysis to file")
-        with open(arguments.output, mode="w", encoding="utf-8") as f:
-            f.write(json.dumps(result_dict, indent=2))
-    except (FileExistsError, FileNotFoundError) as e:
+        write_analysis(result_dict, arguments.output, arguments.format)
+    except (FileExistsError, FileNotFoundError, ModuleNotFoundError) as e:
         logger.LOGGER.debug(traceback.format_exc())
         logger.LOGGER.info(e)
         sys.exit(1)
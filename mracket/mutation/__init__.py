@@ -10,6 +10,8 @@ from mracket.reader import syntax
 class Mutation:
     """A code mutation."""
 
+    __slots__ = ("original", "replacement", "explanation")
+
     original: syntax.RacketASTNode
     replacement: syntax.RacketASTNode
     explanation: str
@@ -17,7 +19,20 @@ class Mutation:
 
 @dataclasses.dataclass(frozen=True)
 class Mutant:
-    """A program mutant."""
+    """A program mutant.
+
+    The mutant is stored as a patch of the program source, so that all the mutants of a
+    program share a single copy of its source.
+    """
+
+    __slots__ = ("mutation", "program_source", "start", "end", "replacement_source")
 
     mutation: Mutation
-    source: str
+    program_source: str
+    start: int
+    end: int
+    replacement_source: str
+
+    @property
+    def source(self) -> str:
+        return self.program_source[: self.start] + self.replacement_source + self.program_source[self.end :]
@@ -0,0 +1,36 @@
+"""Tests for mracket.mutation.applier."""
+from __future__ import annotations
+
+from mracket.mutation.applier import MutationApplier
+from mracket.mutation.generator import ProcedureApplicationReplacement
+from mracket.mutation.mutator import Mutator
+from mracket.reader.lexer import Lexer
+from mracket.reader.parser import Parser
+from mracket.reader.stringify import Stringifier
+
+
+def test_mutants_do_not_leak() -> None:
+    source = "#lang racket\n(and (or 1) (or 2))\n(or 3)"
+    program = Parser().parse(Lexer().tokenize(source))
+    mutations = list(Mutator([ProcedureApplicationReplacement({"or": ["#t"]})]).generate_mutations(program))
+
+    mutants = [mutant.source for mutant in MutationApplier(program, mutations).apply_mutations()]
+
+    assert mutants == [
+        "#lang racket\n(and #t (or 2))\n(or 3)",
+        "#lang racket\n(and (or 1) #t)\n(or 3)",
+        "#lang racket\n(and (or 1) (or 2))\n#t",
+    ]
+    assert Stringifier().visit(program) == source
+
+
+def test_mutants_of_deeply_nested_program() -> None:
+    depth = 10_000
+    source = "#lang racket\n" + "(or " * depth + "1" + ")" * depth
+    program = Parser().parse(Lexer().tokenize(source))
+    mutations = list(Mutator([ProcedureApplicationReplacement({"or": ["#t"]})]).generate_mutations(program))
+
+    mutants = [mutant.source for mutant in MutationApplier(program, mutations).apply_mutations()]
+
+    assert len(mutants) == depth
+    assert mutants[-1] == "#lang racket\n" + "(or " * (depth - 1) + "#t" + ")" * (depth - 1)
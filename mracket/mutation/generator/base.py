@@ -2,14 +2,48 @@
 from __future__ import annotations
 
 import abc
+import functools
 from collections.abc import Generator
 
 from mracket import mutation
 from mracket.reader import syntax
 
+VISIT_METHOD_NAMES: dict[type[syntax.RacketASTNode], str] = {
+    syntax.RacketProgramNode: "visit_program_node",
+    syntax.RacketReaderDirectiveNode: "visit_reader_directive_node",
+    syntax.RacketNameDefinitionNode: "visit_name_definition_node",
+    syntax.RacketStructureDefinitionNode: "visit_structure_definition_node",
+    syntax.RacketLiteralNode: "visit_literal_node",
+    syntax.RacketNameNode: "visit_name_node",
+    syntax.RacketCondNode: "visit_cond_node",
+    syntax.RacketLambdaNode: "visit_lambda_node",
+    syntax.RacketLetNode: "visit_let_node",
+    syntax.RacketLocalNode: "visit_local_node",
+    syntax.RacketProcedureApplicationNode: "visit_procedure_application_node",
+    syntax.RacketTestCaseNode: "visit_test_case_node",
+    syntax.RacketLibraryRequireNode: "visit_library_require_node",
+}
+
 
 class MutationGenerator(syntax.RacketASTVisitor, metaclass=abc.ABCMeta):
-    """Mutation generator base class."""
+    """Mutation generator base class.
+
+    Every node is visited by default and generates no mutations, so a generator only
+    needs to override the visit methods of the nodes that it mutates.
+    """
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def generates_mutations_for(cls, node_type: type[syntax.RacketASTNode]) -> bool:
+        """Whether the generator can generate mutations for nodes of a type.
+
+        :param node_type: A Racket AST node type
+        :return: False if visiting nodes of the type never generates mutations
+        """
+        if cls.visit is not MutationGenerator.visit or node_type not in VISIT_METHOD_NAMES:
+            return True
+        method_name = VISIT_METHOD_NAMES[node_type]
+        return getattr(cls, method_name) is not getattr(MutationGenerator, method_name)
 
     def visit_program_node(self, node: syntax.RacketProgramNode) -> Generator[mutation.Mutation, None, None]:
         return
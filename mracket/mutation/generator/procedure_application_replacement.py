@@ -1,6 +1,7 @@
 """A procedure application replacement mutator."""
 from __future__ import annotations
 
+import sys
 from collections.abc import Generator, Mapping
 
 from mracket import mutation
@@ -9,19 +10,27 @@ from mracket.reader import lexer, parser, stringify, syntax
 
 
 class ProcedureApplicationReplacement(base.MutationGenerator):
-    """Replaces procedure applications with expressions."""
+    """Replaces procedure applications with expressions.
+
+    Each replacement is parsed and stringified once, when the generator is built, and
+    the pairs of parsed and stringified replacements are shared by every mutation.
+    """
 
     stringifier = stringify.Stringifier()
 
     def __init__(self, replacements: Mapping[str, list[str]]) -> None:
-        lexer_ = lexer.Lexer()
-        parser_ = parser.Parser()
-        processed_replacements = {}
+        # each replacement is parsed on its own, so that one which is not exactly a single expression is never
+        # made up for by another, but the lexer and parser are shared between them
+        lexer_, parser_ = lexer.Lexer(), parser.Parser()
+        processed_replacements: dict[str, tuple[tuple[syntax.RacketExpressionNode, str], ...]] = {}
         for procedure_name in replacements:
             processed_sources = []
             for source in replacements[procedure_name]:
-                processed_sources.append(parser_.parse_expression(lexer_.tokenize(source)))
-            processed_replacements[procedure_name] = processed_sources
+                new_nodes = parser_.parse_expressions(lexer_.tokenize(source))
+                if len(new_nodes) != 1:
+                    raise ValueError(f"Replacement is not a single expression: {source!r}")
+                processed_sources.append((new_nodes[0], self.stringifier.visit(new_nodes[0])))
+            processed_replacements[sys.intern(procedure_name)] = tuple(processed_sources)
         self.replacements = processed_replacements
 
     def visit_procedure_application_node(
@@ -36,11 +45,11 @@ class ProcedureApplicationReplacement(base.MutationGenerator):
         if procedure_name not in self.replacements:
             return
 
-        for new_node in self.replacements[procedure_name]:
+        for new_node, new_source in self.replacements[procedure_name]:
             explanation = (
                 f"Replace procedure application of `{procedure_name}'"
                 f" at line {procedure.token.lineno}, column {procedure.token.colno}"
-                f" with {self.stringifier.visit(new_node)}"
+                f" with {new_source}"
             )
             yield mutation.Mutation(
                 original=node,
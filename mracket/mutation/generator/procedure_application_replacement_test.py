@@ -35,3 +35,17 @@ def test_mutation_count(mappings: Mapping[str, list[str]], source: str, mutation
 )
 def test_mutants(mappings: Mapping[str, list[str]], source: str, mutants: list[str]) -> None:
     test.generator.utils.assert_mutants(ProcedureApplicationReplacement(mappings), source, mutants)
+
+
+@pytest.mark.parametrize(
+    "mappings",
+    [
+        {"and": [""]},
+        {"and": ["#t #f"]},
+        {"and": ["#t #f"], "or": [""]},
+        {"and": ["", "1 2"]},
+    ],
+)
+def test_replacement_not_single_expression(mappings: Mapping[str, list[str]]) -> None:
+    with pytest.raises(ValueError):
+        ProcedureApplicationReplacement(mappings)
@@ -1,6 +1,7 @@
 """A procedure replacement mutator."""
 from __future__ import annotations
 
+import sys
 from collections.abc import Generator, Mapping
 
 from mracket import mutation
@@ -9,10 +10,20 @@ from mracket.reader import lexer, syntax
 
 
 class ProcedureReplacement(base.MutationGenerator):
-    """Replaces procedures with its replacements."""
+    """Replaces procedures with its replacements.
+
+    The name node of each replacement is built once, when the generator is built, and
+    is shared by every mutation that replaces a procedure with it.
+    """
 
     def __init__(self, replacements: Mapping[str, list[str]]) -> None:
-        self.replacements = replacements
+        self.replacements = {
+            sys.intern(procedure_name): tuple(
+                syntax.RacketNameNode(token=lexer.Token.from_source(lexer.TokenType.SYMBOL, replacement))
+                for replacement in replacements[procedure_name]
+            )
+            for procedure_name in replacements
+        }
 
     def visit_procedure_application_node(
         self, node: syntax.RacketProcedureApplicationNode
@@ -26,12 +37,11 @@ class ProcedureReplacement(base.MutationGenerator):
         if procedure_name not in self.replacements:
             return
 
-        for replacement in self.replacements[procedure_name]:
-            new_node = syntax.RacketNameNode(token=lexer.Token.from_source(lexer.TokenType.SYMBOL, replacement))
+        for new_node in self.replacements[procedure_name]:
             explanation = (
                 f"Replace procedure `{procedure_name}'"
                 f" at line {procedure.token.lineno}, column {procedure.token.colno}"
-                f" with {replacement}"
+                f" with {new_node.token.source}"
             )
             yield mutation.Mutation(
                 original=procedure,
@@ -2,7 +2,10 @@
 from __future__ import annotations
 
 import itertools
-from collections.abc import Generator, Mapping
+import random
+import sys
+from collections.abc import Callable, Generator, Iterator, Mapping
+from typing import Any
 
 from mracket import mutation
 from mracket.mutation.generator import base
@@ -13,97 +16,142 @@ class Mutator(syntax.RacketASTVisitor):
     """A code mutator.
 
     For each node, it yields each mutation that each mutation generator generates.
+
+    The mutations are generated lazily, so when only a sample of them is wanted, each
+    mutation is kept with probability sample_rate, and generation stops as soon as
+    max_mutations mutations have been kept. A generator is only asked to visit the
+    nodes of the types it can generate mutations for.
+
+    The program is walked with an explicit stack rather than by recursion. Visiting a
+    node returns its children, each paired with the mutator that visits it, so that a
+    name-specific mutator takes over the expression of its definition. Nodes are
+    dispatched on their type through a table of bound methods, rather than through the
+    node's accept_visitor method. Nodes whose children are never mutated, such as names
+    and literals, have no entry and are not visited past the generators.
     """
 
     def __init__(
-        self, generators: list[base.MutationGenerator], name_specific_mutators: Mapping[str, Mutator] | None = None
+        self,
+        generators: list[base.MutationGenerator],
+        name_specific_mutators: Mapping[str, Mutator] | None = None,
+        max_mutations: int | None = None,
+        sample_rate: float | None = None,
+        seed: int | None = None,
     ) -> None:
+        if max_mutations is not None and max_mutations < 0:
+            raise ValueError(f"max_mutations must be non-negative, got {max_mutations}")
+        if sample_rate is not None and not 0 <= sample_rate <= 1:
+            raise ValueError(f"sample_rate must be between 0 and 1, got {sample_rate}")
         self.generators = generators
-        self.name_specific_mutators = name_specific_mutators or {}
+        self.name_specific_mutators = {
+            sys.intern(name): name_specific_mutator
+            for name, name_specific_mutator in (name_specific_mutators or {}).items()
+        }
+        self.max_mutations = max_mutations
+        self.sample_rate = sample_rate
+        self.seed = seed
+        # the generators that can generate mutations for each node type, filled in as the types are met
+        self._generators_by_node_type: dict[type, list[base.MutationGenerator]] = {}
+        self._visitors: dict[type, Callable[[Any], list[tuple[Mutator, syntax.RacketASTNode]]]] = {
+            syntax.RacketProgramNode: self.visit_program_node,
+            syntax.RacketNameDefinitionNode: self.visit_name_definition_node,
+            syntax.RacketStructureDefinitionNode: self.visit_structure_definition_node,
+            syntax.RacketCondNode: self.visit_cond_node,
+            syntax.RacketLambdaNode: self.visit_lambda_node,
+            syntax.RacketLetNode: self.visit_let_node,
+            syntax.RacketLocalNode: self.visit_local_node,
+            syntax.RacketProcedureApplicationNode: self.visit_procedure_application_node,
+        }
 
     def generate_mutations(self, node: syntax.RacketProgramNode) -> Generator[mutation.Mutation, None, None]:
-        return self.visit(node)
+        mutations: Iterator[mutation.Mutation] = self.visit(node)
+        if self.sample_rate is not None:
+            sample_rate, random_ = self.sample_rate, random.Random(self.seed)
+            mutations = (mut for mut in mutations if random_.random() < sample_rate)
+        if self.max_mutations is not None:
+            mutations = itertools.islice(mutations, self.max_mutations)
+        yield from mutations
 
     def visit(self, node: syntax.RacketASTNode) -> Generator[mutation.Mutation, None, None]:
-        for generator in self.generators:
-            for mut in generator.visit(node):
-                yield mut
-        for mut in node.accept_visitor(self):
-            yield mut
-
-    def visit_program_node(self, node: syntax.RacketProgramNode) -> Generator[mutation.Mutation, None, None]:
-        for child_node in (node.reader_directive, *node.statements):
-            for mut in self.visit(child_node):
-                yield mut
+        stack: list[tuple[Mutator, syntax.RacketASTNode]] = [(self, node)]
+        while len(stack) > 0:
+            mutator_, node = stack.pop()
+            for generator in mutator_._get_generators(type(node)):
+                yield from generator.visit(node)
+            visitor = mutator_._visitors.get(type(node))
+            if visitor is not None:
+                stack.extend(reversed(visitor(node)))
+
+    def visit_program_node(self, node: syntax.RacketProgramNode) -> list[tuple[Mutator, syntax.RacketASTNode]]:
+        children: list[tuple[Mutator, syntax.RacketASTNode]] = [(self, node.reader_directive)]
+        children.extend((self, child_node) for child_node in node.statements)
+        return children
 
     def visit_reader_directive_node(
         self, node: syntax.RacketReaderDirectiveNode
-    ) -> Generator[mutation.Mutation, None, None]:
-        return
-        yield
+    ) -> list[tuple[Mutator, syntax.RacketASTNode]]:
+        return []
 
     def visit_name_definition_node(
         self, node: syntax.RacketNameDefinitionNode
-    ) -> Generator[mutation.Mutation, None, None]:
+    ) -> list[tuple[Mutator, syntax.RacketASTNode]]:
         name_specific_mutator = self.name_specific_mutators.get(node.name.token.source, None)
-        if name_specific_mutator is not None:
-            for mut in self.visit(node.name):
-                yield mut
-            for mut in name_specific_mutator.visit(node.expression):
-                yield mut
-        else:
-            for child_node in (node.name, node.expression):
-                for mut in self.visit(child_node):
-                    yield mut
+        return [(self, node.name), (name_specific_mutator or self, node.expression)]
 
     def visit_structure_definition_node(
         self, node: syntax.RacketStructureDefinitionNode
-    ) -> Generator[mutation.Mutation, None, None]:
-        for child_node in (node.name, *node.fields):
-            for mut in self.visit(child_node):
-                yield mut
-
-    def visit_literal_node(self, node: syntax.RacketLiteralNode) -> Generator[mutation.Mutation, None, None]:
-        return
-        yield
-
-    def visit_name_node(self, node: syntax.RacketNameNode) -> Generator[mutation.Mutation, None, None]:
-        return
-        yield
-
-    def visit_cond_node(self, node: syntax.RacketCondNode) -> Generator[mutation.Mutation, None, None]:
-        for child_node in itertools.chain.from_iterable(node.branches):
-            for mut in self.visit(child_node):
-                yield mut
-
-    def visit_lambda_node(self, node: syntax.RacketLambdaNode) -> Generator[mutation.Mutation, None, None]:
-        for child_node in (*node.variables, node.expression):
-            for mut in self.visit(child_node):
-                yield mut
-
-    def visit_let_node(self, node: syntax.RacketLetNode) -> Generator[mutation.Mutation, None, None]:
-        for child_node in (*itertools.chain.from_iterable(node.local_definitions), node.expression):
-            for mut in self.visit(child_node):
-                yield mut
-
-    def visit_local_node(self, node: syntax.RacketLocalNode) -> Generator[mutation.Mutation, None, None]:
-        for child_node in (*node.definitions, node.expression):
-            for mut in self.visit(child_node):
-                yield mut
+    ) -> list[tuple[Mutator, syntax.RacketASTNode]]:
+        children: list[tuple[Mutator, syntax.RacketASTNode]] = [(self, node.name)]
+        children.extend((self, child_node) for child_node in node.fields)
+        return children
+
+    def visit_literal_node(self, node: syntax.RacketLiteralNode) -> list[tuple[Mutator, syntax.RacketASTNode]]:
+        return []
+
+    def visit_name_node(self, node: syntax.RacketNameNode) -> list[tuple[Mutator, syntax.RacketASTNode]]:
+        return []
+
+    def visit_cond_node(self, node: syntax.RacketCondNode) -> list[tuple[Mutator, syntax.RacketASTNode]]:
+        children: list[tuple[Mutator, syntax.RacketASTNode]] = []
+        for condition, expression in node.branches:
+            children.append((self, condition))
+            children.append((self, expression))
+        return children
+
+    def visit_lambda_node(self, node: syntax.RacketLambdaNode) -> list[tuple[Mutator, syntax.RacketASTNode]]:
+        children: list[tuple[Mutator, syntax.RacketASTNode]] = [(self, child_node) for child_node in node.variables]
+        children.append((self, node.expression))
+        return children
+
+    def visit_let_node(self, node: syntax.RacketLetNode) -> list[tuple[Mutator, syntax.RacketASTNode]]:
+        children: list[tuple[Mutator, syntax.RacketASTNode]] = []
+        for name, expression in node.local_definitions:
+            children.append((self, name))
+            children.append((self, expression))
+        children.append((self, node.expression))
+        return children
+
+    def visit_local_node(self, node: syntax.RacketLocalNode) -> list[tuple[Mutator, syntax.RacketASTNode]]:
+        children: list[tuple[Mutator, syntax.RacketASTNode]] = [(self, child_node) for child_node in node.definitions]
+        children.append((self, node.expression))
+        return children
 
     def visit_procedure_application_node(
         self, node: syntax.RacketProcedureApplicationNode
-    ) -> Generator[mutation.Mutation, None, None]:
-        for child_node in node.expressions:
-            for mut in self.visit(child_node):
-                yield mut
+    ) -> list[tuple[Mutator, syntax.RacketASTNode]]:
+        return [(self, child_node) for child_node in node.expressions]
 
-    def visit_test_case_node(self, node: syntax.RacketTestCaseNode) -> Generator[mutation.Mutation, None, None]:
-        return
-        yield
+    def visit_test_case_node(self, node: syntax.RacketTestCaseNode) -> list[tuple[Mutator, syntax.RacketASTNode]]:
+        return []
 
     def visit_library_require_node(
         self, node: syntax.RacketLibraryRequireNode
-    ) -> Generator[mutation.Mutation, None, None]:
-        return
-        yield
+    ) -> list[tuple[Mutator, syntax.RacketASTNode]]:
+        return []
+
+    def _get_generators(self, node_type: type) -> list[base.MutationGenerator]:
+        generators = self._generators_by_node_type.get(node_type)
+        if generators is None:
+            generators = [generator for generator in self.generators if generator.generates_mutations_for(node_type)]
+            self._generators_by_node_type[node_type] = generators
+        return generators
@@ -1,10 +1,14 @@
 """Tests for mracket.mutation.mutator."""
 from __future__ import annotations
 
-from mracket.mutation.generator import ProcedureReplacement
+from collections.abc import Generator
+
+from mracket import mutation
+from mracket.mutation.generator import MutationGenerator, ProcedureReplacement
 from mracket.mutation.mutator import Mutator
 from mracket.reader.lexer import Lexer
 from mracket.reader.parser import Parser
+from mracket.reader.syntax import RacketLiteralNode, RacketNameNode
 
 
 def test_name_specific_mutator() -> None:
@@ -27,3 +31,37 @@ def test_name_specific_mutator() -> None:
     assert mutation_2.original.token.source == "+"
     assert mutation_2.original.token.offset == 32
     assert mutation_2.replacement.token.source == "-"
+
+
+def test_sampled_mutations() -> None:
+    source = "#lang racket\n" + "\n".join("(+ 1)" for _ in range(100))
+    program = Parser().parse(Lexer().tokenize(source))
+    all_mutations = list(Mutator([ProcedureReplacement({"+": ["-", "*"]})]).generate_mutations(program))
+
+    limited_mutations = list(
+        Mutator([ProcedureReplacement({"+": ["-", "*"]})], max_mutations=3).generate_mutations(program)
+    )
+    sampled_mutations = list(
+        Mutator([ProcedureReplacement({"+": ["-", "*"]})], sample_rate=0.5, seed=0).generate_mutations(program)
+    )
+    resampled_mutations = list(
+        Mutator([ProcedureReplacement({"+": ["-", "*"]})], sample_rate=0.5, seed=0).generate_mutations(program)
+    )
+
+    assert [mut.explanation for mut in limited_mutations] == [mut.explanation for mut in all_mutations[:3]]
+    assert 0 < len(sampled_mutations) < len(all_mutations)
+    assert [mut.explanation for mut in sampled_mutations] == [mut.explanation for mut in resampled_mutations]
+
+
+def test_generators_visit_overridden_node_types() -> None:
+    class LiteralReplacement(MutationGenerator):
+        def visit_literal_node(self, node: RacketLiteralNode) -> Generator[mutation.Mutation, None, None]:
+            yield mutation.Mutation(original=node, replacement=node, explanation="")
+
+    assert LiteralReplacement.generates_mutations_for(RacketLiteralNode)
+    assert not LiteralReplacement.generates_mutations_for(RacketNameNode)
+
+    program = Parser().parse(Lexer().tokenize("#lang racket\n(+ 1 (- 2 3))"))
+    mutations = list(Mutator([LiteralReplacement(), ProcedureReplacement({"+": ["-"]})]).generate_mutations(program))
+
+    assert [mut.original.token.source for mut in mutations] == ["+", "1", "2", "3"]
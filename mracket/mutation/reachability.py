@@ -0,0 +1,201 @@
+"""Static reachability of a program's code from its top-level."""
+from __future__ import annotations
+
+from collections.abc import Generator
+
+from mracket.reader import syntax
+
+
+class NameCollector(syntax.RacketASTVisitor):
+    """Collects every name referenced within a node.
+
+    The node is walked with an explicit stack rather than by recursion. Visiting a node
+    returns its children.
+    """
+
+    def visit(self, node: syntax.RacketASTNode) -> Generator[str, None, None]:
+        stack = [node]
+        while len(stack) > 0:
+            node = stack.pop()
+            if isinstance(node, syntax.RacketNameNode):
+                yield node.token.source
+            else:
+                stack.extend(node.accept_visitor(self))
+
+    def visit_program_node(self, node: syntax.RacketProgramNode) -> list[syntax.RacketASTNode]:
+        return list(node.statements)
+
+    def visit_reader_directive_node(self, node: syntax.RacketReaderDirectiveNode) -> list[syntax.RacketASTNode]:
+        return []
+
+    def visit_name_definition_node(self, node: syntax.RacketNameDefinitionNode) -> list[syntax.RacketASTNode]:
+        return [node.expression]
+
+    def visit_structure_definition_node(self, node: syntax.RacketStructureDefinitionNode) -> list[syntax.RacketASTNode]:
+        return []
+
+    def visit_literal_node(self, node: syntax.RacketLiteralNode) -> list[syntax.RacketASTNode]:
+        return []
+
+    def visit_name_node(self, node: syntax.RacketNameNode) -> list[syntax.RacketASTNode]:
+        return []
+
+    def visit_cond_node(self, node: syntax.RacketCondNode) -> list[syntax.RacketASTNode]:
+        return [child_node for branch in node.branches for child_node in branch]
+
+    def visit_lambda_node(self, node: syntax.RacketLambdaNode) -> list[syntax.RacketASTNode]:
+        return [node.expression]
+
+    def visit_let_node(self, node: syntax.RacketLetNode) -> list[syntax.RacketASTNode]:
+        return [
+            *(child_node for local_definition in node.local_definitions for child_node in local_definition),
+            node.expression,
+        ]
+
+    def visit_local_node(self, node: syntax.RacketLocalNode) -> list[syntax.RacketASTNode]:
+        return [*node.definitions, node.expression]
+
+    def visit_procedure_application_node(
+        self, node: syntax.RacketProcedureApplicationNode
+    ) -> list[syntax.RacketASTNode]:
+        return list(node.expressions)
+
+    def visit_test_case_node(self, node: syntax.RacketTestCaseNode) -> list[syntax.RacketASTNode]:
+        return list(node.expressions)
+
+    def visit_library_require_node(self, node: syntax.RacketLibraryRequireNode) -> list[syntax.RacketASTNode]:
+        return []
+
+
+class NodeCollector(syntax.RacketASTVisitor):
+    """Collects the ids of every operand expression within an expression, including itself.
+
+    Binding positions, such as the variables of a lambda, and operators, which may be
+    special forms and which in the teaching languages must be names, are not operand
+    expressions, so they are not collected. Their children are.
+
+    The expression is walked with an explicit stack rather than by recursion. Visiting
+    a node returns its children, each paired with whether it is an operand expression.
+    """
+
+    def visit(self, node: syntax.RacketASTNode) -> Generator[int, None, None]:
+        stack = [(node, True)]
+        while len(stack) > 0:
+            node, is_operand = stack.pop()
+            if is_operand:
+                yield id(node)
+            stack.extend(node.accept_visitor(self))
+
+    def visit_program_node(self, node: syntax.RacketProgramNode) -> list[tuple[syntax.RacketASTNode, bool]]:
+        return [(child_node, True) for child_node in node.statements]
+
+    def visit_reader_directive_node(
+        self, node: syntax.RacketReaderDirectiveNode
+    ) -> list[tuple[syntax.RacketASTNode, bool]]:
+        return []
+
+    def visit_name_definition_node(
+        self, node: syntax.RacketNameDefinitionNode
+    ) -> list[tuple[syntax.RacketASTNode, bool]]:
+        return [(node.expression, True)]
+
+    def visit_structure_definition_node(
+        self, node: syntax.RacketStructureDefinitionNode
+    ) -> list[tuple[syntax.RacketASTNode, bool]]:
+        return []
+
+    def visit_literal_node(self, node: syntax.RacketLiteralNode) -> list[tuple[syntax.RacketASTNode, bool]]:
+        return []
+
+    def visit_name_node(self, node: syntax.RacketNameNode) -> list[tuple[syntax.RacketASTNode, bool]]:
+        return []
+
+    def visit_cond_node(self, node: syntax.RacketCondNode) -> list[tuple[syntax.RacketASTNode, bool]]:
+        return [(child_node, True) for branch in node.branches for child_node in branch]
+
+    def visit_lambda_node(self, node: syntax.RacketLambdaNode) -> list[tuple[syntax.RacketASTNode, bool]]:
+        return [(node.expression, True)]
+
+    def visit_let_node(self, node: syntax.RacketLetNode) -> list[tuple[syntax.RacketASTNode, bool]]:
+        return [*((expression, True) for _, expression in node.local_definitions), (node.expression, True)]
+
+    def visit_local_node(self, node: syntax.RacketLocalNode) -> list[tuple[syntax.RacketASTNode, bool]]:
+        return [
+            *(
+                (child_node.expression, True)
+                for child_node in node.definitions
+                if isinstance(child_node, syntax.RacketNameDefinitionNode)
+            ),
+            (node.expression, True),
+        ]
+
+    def visit_procedure_application_node(
+        self, node: syntax.RacketProcedureApplicationNode
+    ) -> list[tuple[syntax.RacketASTNode, bool]]:
+        return [(child_node, index > 0) for index, child_node in enumerate(node.expressions)]
+
+    def visit_test_case_node(self, node: syntax.RacketTestCaseNode) -> list[tuple[syntax.RacketASTNode, bool]]:
+        return [(child_node, True) for child_node in node.expressions]
+
+    def visit_library_require_node(
+        self, node: syntax.RacketLibraryRequireNode
+    ) -> list[tuple[syntax.RacketASTNode, bool]]:
+        return []
+
+
+def defined_value_names(program: syntax.RacketProgramNode) -> set[str]:
+    """Find the names defined by the top-level name definitions of the program that are not functions.
+
+    In the teaching languages, a name bound to a function can only be used as an operator.
+
+    :param program: A program
+    :return: Set of the defined names that are not functions
+    """
+    return {
+        statement.name.token.source
+        for statement in program.statements
+        if isinstance(statement, syntax.RacketNameDefinitionNode)
+        and not isinstance(statement.expression, syntax.RacketLambdaNode)
+    }
+
+
+def unreachable_nodes(program: syntax.RacketProgramNode) -> set[int]:
+    """Find the operand expressions of the program that can never be evaluated.
+
+    The body of a top-level function is evaluated only if the function is referenced,
+    directly or through other functions, by a statement that is not a definition. Names
+    are compared without regard to scope, so some unreachable expressions may be missed,
+    but every expression found is never evaluated. It is still compiled, so replacing it
+    can change whether the program compiles at all.
+
+    :param program: A program
+    :return: Set of the ids of the unreachable operand expressions
+    """
+    name_collector = NameCollector()
+    functions: dict[str, syntax.RacketLambdaNode] = {}
+    reached_names: set[str] = set()
+    for statement in program.statements:
+        if isinstance(statement, syntax.RacketNameDefinitionNode):
+            if isinstance(statement.expression, syntax.RacketLambdaNode):
+                functions[statement.name.token.source] = statement.expression
+            else:
+                reached_names.update(name_collector.visit(statement))
+        elif not isinstance(statement, syntax.RacketStructureDefinitionNode):
+            reached_names.update(name_collector.visit(statement))
+
+    unvisited_names = list(reached_names)
+    while len(unvisited_names) > 0:
+        function = functions.get(unvisited_names.pop())
+        if function is None:
+            continue
+        for name in name_collector.visit(function):
+            if name not in reached_names:
+                reached_names.add(name)
+                unvisited_names.append(name)
+
+    node_collector = NodeCollector()
+    nodes: set[int] = set()
+    for name, function in functions.items():
+        if name not in reached_names:
+            nodes.update(node_collector.visit(function.expression))
+    return nodes
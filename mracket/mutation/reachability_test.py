@@ -0,0 +1,49 @@
+"""Tests for mracket.mutation.reachability."""
+from __future__ import annotations
+
+import pytest
+
+from mracket.mutation.reachability import defined_value_names, unreachable_nodes
+from mracket.reader.lexer import Lexer
+from mracket.reader.parser import Parser
+from mracket.reader.stringify import Stringifier
+
+
+@pytest.mark.parametrize(
+    "source,unreachable_sources",
+    [
+        ["(define (f x) (+ x 1))", ["(+ x 1)", "x", "1"]],
+        ["(define (f x) (+ x 1))\n(check-expect (f 1) 2)", []],
+        ["(define (f x) (g x))\n(define (g x) (+ x 1))\n(check-expect (f 1) 2)", []],
+        ["(define (f x) (g x))\n(define (g x) (+ x 1))\n(check-expect (g 1) 2)", ["(g x)", "x"]],
+        ["(define (f x) (let ((y 1)) (lambda (z) y)))", ["(let ((y 1)) (lambda (z) y))", "1", "(lambda (z) y)", "y"]],
+        ["(define (f x) ((lambda (y) y) x))", ["((lambda (y) y) x)", "y", "x"]],
+        ["(define (f x) ((g x) 1))", ["((g x) 1)", "x", "1"]],
+        ["(define (f x) (+ x 1))\n(define y (list f))", []],
+        ["(define x (+ 1 2))", []],
+    ],
+)
+def test_unreachable_nodes(source: str, unreachable_sources: list[str]) -> None:
+    program = Parser().parse(Lexer().tokenize(f"#lang racket\n{source}"))
+    stringified_program, spans = Stringifier().visit_with_spans(program)
+
+    nodes = unreachable_nodes(program)
+
+    assert sorted(stringified_program[slice(*spans[node])] for node in nodes) == sorted(unreachable_sources)
+
+
+def test_defined_value_names() -> None:
+    program = Parser().parse(
+        Lexer().tokenize(
+            "#lang racket\n(define (f x) x)\n(define g (lambda (x) x))\n(define y 1)\n(define-struct posn (x y))"
+        )
+    )
+
+    assert defined_value_names(program) == {"y"}
+
+
+def test_unreachable_nodes_of_deeply_nested_function() -> None:
+    depth = 10_000
+    program = Parser().parse(Lexer().tokenize("#lang racket\n(define (f x) " + "(g " * depth + "x" + ")" * depth + ")"))
+
+    assert len(unreachable_nodes(program)) == depth + 1
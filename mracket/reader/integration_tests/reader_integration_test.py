@@ -1,6 +1,7 @@
 """Integration tests for mracket.reader."""
 from __future__ import annotations
 
+import concurrent.futures
 import subprocess
 import tempfile
 
@@ -13,9 +14,11 @@ from mracket.reader.stringify import Stringifier
 
 
 def test_read_program_succeeds() -> None:
+    lexer = Lexer()
+    parser = Parser()
     for source in test.inputs.read_contents():
-        tokens = Lexer().tokenize(source)
-        Parser().parse(tokens)
+        tokens = lexer.tokenize(source)
+        parser.parse(tokens)
 
 
 @pytest.mark.parametrize(
@@ -52,38 +55,56 @@ def test_desugar(source: str, desugared_source: str) -> None:
 def test_stringify_idempotent() -> None:
     lexer = Lexer()
     parser = Parser()
+    stringifier = Stringifier()
     for source in test.inputs.read_contents():
         tokens_0 = lexer.tokenize(source)
         program_0 = parser.parse(tokens_0)
-        stringified_program_0 = Stringifier().visit(program_0)
+        stringified_program_0 = stringifier.visit(program_0)
 
         tokens_1 = lexer.tokenize(stringified_program_0)
         program_1 = parser.parse(tokens_1)
-        stringified_program_1 = Stringifier().visit(program_1)
+        stringified_program_1 = stringifier.visit(program_1)
 
         assert stringified_program_0 == stringified_program_1
 
 
 @pytest.mark.slow
 def test_racket_output_unchanged() -> None:
-    for file_name in test.inputs.file_paths(r"^(?!test-case).+"):
-        original_process = subprocess.Popen(["racket", file_name], stdout=subprocess.PIPE)
+    file_names = list(test.inputs.file_paths(r"^(?!test-case).+"))
+    # the time is spent waiting on racket, so the files are run concurrently
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        results = list(executor.map(run_original_and_stringified, file_names))
+
+    for original_result, transformed_result in results:
+        (original_returncode, original_output, original_error) = original_result
+        (transformed_returncode, transformed_output, _) = transformed_result
+        assert original_returncode == transformed_returncode
+        if original_error is None:
+            assert original_output == transformed_output
 
-        with open(file_name) as f:
-            source = f.read()
-        tokens = Lexer().tokenize(source)
-        program = Parser().parse(tokens)
-        stringified_program = Stringifier().visit(program)
 
-        with tempfile.NamedTemporaryFile(mode="w") as tf:
-            tf.write(stringified_program)
-            tf.seek(0)
+def run_original_and_stringified(
+    file_name: str,
+) -> tuple[tuple[int, bytes, bytes | None], tuple[int, bytes, bytes | None]]:
+    original_process = subprocess.Popen(["racket", file_name], stdout=subprocess.PIPE)
 
-            transformed_process = subprocess.Popen(["racket", tf.name], stdout=subprocess.PIPE)
+    # the reader is not thread-safe, so each file is read by its own lexer, parser, and stringifier
+    with open(file_name) as f:
+        source = f.read()
+    tokens = Lexer().tokenize(source)
+    program = Parser().parse(tokens)
+    stringified_program = Stringifier().visit(program)
 
-            (original_output, original_error) = original_process.communicate()
-            (transformed_output, transformed_error) = transformed_process.communicate()
+    with tempfile.NamedTemporaryFile(mode="w") as tf:
+        tf.write(stringified_program)
+        tf.seek(0)
 
-        assert original_process.returncode == transformed_process.returncode
-        if original_error is None:
-            assert original_output == transformed_output
+        transformed_process = subprocess.Popen(["racket", tf.name], stdout=subprocess.PIPE)
+
+        (original_output, original_error) = original_process.communicate()
+        (transformed_output, transformed_error) = transformed_process.communicate()
+
+    return (
+        (original_process.returncode, original_output, original_error),
+        (transformed_process.returncode, transformed_output, transformed_error),
+    )
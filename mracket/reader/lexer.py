@@ -5,7 +5,8 @@ from __future__ import annotations
 import dataclasses
 import enum
 import re
-from collections.abc import Generator, Sequence
+import sys
+from collections.abc import Callable, Sequence
 from typing import cast
 
 from mracket.reader import errors
@@ -124,6 +125,7 @@ ABBREVIATED_BOOLEAN = re.compile(r"#[TtFf]")
 BOOLEAN = re.compile(r"#(true|false)")
 CHARACTER = re.compile(fr"#\\(null?|backspace|tab|newline|linefeed|vtab|page|return|space|rubout|{DIGIT_8}{{3}}|u{DIGIT_16}{{1,4}}|U{DIGIT_16}{{1,8}}|[a-zA-Z](?![a-zA-Z])|[0-7](?![0-7])|[^a-zA-Z0-7])")
 DELIMITER = re.compile(r"(,@|[()[\]{}'`,])")
+DECIMAL_NUMBER = re.compile(fr"{NUMBER_10}(?=$|[()[\]{{}}'`,\"\s])", re.IGNORECASE)
 LINE_COMMENT = re.compile(r";.*")
 NUMBER = re.compile(fr"({GENERAL_NUMBER}|{LEADING_EXACTNESS_NUMBER})(?=$|[()[\]{{}}'`,\"\s])", re.IGNORECASE)
 READER_DIRECTIVE = re.compile(r"#(lang|reader).*")
@@ -153,6 +155,10 @@ class TokenType(enum.Enum):
     UNQUOTE_SPLICING = "UNQUOTE SPLICING"
     WHITESPACE = "WHITESPACE"
 
+    # members are singletons compared by identity, so they can be hashed by identity, which unlike the hash that
+    # Enum defines in Python, is computed in C; the parser checks token types against sets for almost every token
+    __hash__ = object.__hash__
+
 
 TOKEN_PATTERNS: Sequence[tuple[re.Pattern, TokenType]] = (
     (BOOLEAN, TokenType.BOOLEAN),
@@ -164,17 +170,62 @@ TOKEN_PATTERNS: Sequence[tuple[re.Pattern, TokenType]] = (
     (SYMBOL, TokenType.SYMBOL),
     (DELIMITER, TokenType.DELIMITER),
 )
+DELIMITER_TOKEN_TYPES = {
+    "(": TokenType.LPAREN,
+    "[": TokenType.LPAREN,
+    "{": TokenType.LPAREN,
+    ")": TokenType.RPAREN,
+    "]": TokenType.RPAREN,
+    "}": TokenType.RPAREN,
+    "`": TokenType.QUASIQUOTE,
+    "'": TokenType.QUOTE,
+    ",": TokenType.UNQUOTE,
+    ",@": TokenType.UNQUOTE_SPLICING,
+}
+# the patterns of TOKEN_PATTERNS that can match a token starting with a character, in the same order
+POUND_TOKEN_PATTERNS: Sequence[tuple[re.Pattern, TokenType]] = (
+    (BOOLEAN, TokenType.BOOLEAN),
+    (ABBREVIATED_BOOLEAN, TokenType.BOOLEAN),
+    (CHARACTER, TokenType.CHARACTER),
+    (NUMBER, TokenType.NUMBER),
+    (READER_DIRECTIVE, TokenType.READER_DIRECTIVE),
+)
+# a number that does not start with "#" has no radix or exactness prefix, so only the decimal number pattern is needed
+OTHER_TOKEN_PATTERNS: Sequence[tuple[re.Pattern, TokenType]] = (
+    (DECIMAL_NUMBER, TokenType.NUMBER),
+    (SYMBOL, TokenType.SYMBOL),
+)
+TOKEN_PATTERNS_BY_FIRST_CHARACTER: dict[str, Sequence[tuple[re.Pattern, TokenType]]] = {
+    "#": POUND_TOKEN_PATTERNS,
+    '"': ((STRING, TokenType.STRING),),
+    **{character: ((DELIMITER, TokenType.DELIMITER),) for character in "()[]{}'`,"},
+}
+# the bound match methods of the patterns, so that the lexer does not look them up for every token
+TOKEN_MATCHERS_BY_FIRST_CHARACTER: dict[str, tuple[tuple[Callable[[str, int], re.Match | None], TokenType], ...]] = {
+    character: tuple((pattern.match, token_type) for pattern, token_type in patterns)
+    for character, patterns in TOKEN_PATTERNS_BY_FIRST_CHARACTER.items()
+}
+OTHER_TOKEN_MATCHERS: tuple[tuple[Callable[[str, int], re.Match | None], TokenType], ...] = tuple(
+    (pattern.match, token_type) for pattern, token_type in OTHER_TOKEN_PATTERNS
+)
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(unsafe_hash=True)
 class Token:
-    """A lexical token."""
+    """A lexical token.
+
+    Tokens are never modified once created. The class is not a frozen dataclass, since
+    that makes creating a token, which the lexer does for every token of a program,
+    about twice as slow.
+    """
+
+    __slots__ = ("type", "offset", "lineno", "colno", "source")
 
     type: TokenType
     offset: int
     lineno: int
     colno: int
-    source: str = ""
+    source: str
 
     def __post_init__(self):
         assert self.type is not TokenType.DELIMITER
@@ -192,7 +243,7 @@ class Token:
         return Token(type=token_type, offset=-1, lineno=-1, colno=-1, source=source)
 
 
-EOF_TOKEN = Token(type=TokenType.EOF, offset=-1, lineno=-1, colno=-1)
+EOF_TOKEN = Token(type=TokenType.EOF, offset=-1, lineno=-1, colno=-1, source="")
 DUMMY_TOKEN = cast(Token, None)
 DUMMY_ELSE_SYMBOL_TOKEN = Token(type=TokenType.SYMBOL, offset=-1, lineno=-1, colno=-1, source="else")
 DUMMY_LPAREN_TOKEN = Token(type=TokenType.LPAREN, offset=-1, lineno=-1, colno=-1, source="(")
@@ -203,79 +254,72 @@ class Lexer:
     """A lexer for Racket programs."""
 
     def __init__(self):
-        self._truncated_source = ""
+        self._source = ""
         self._offset = -1
         self._lineno = -1
         self._colno = -1
 
-    def tokenize(self, source: str) -> Generator[Token, None, None]:
+    def tokenize(self, source: str) -> list[Token]:
         """Convert the source program into tokens.
 
         :param source: Racket source code
-        :return: Generator of tokens
+        :return: List of tokens, ending with the EOF token
         """
-        self._truncated_source = source
+        # the source is never sliced, the patterns are matched from the offset of the next token
+        self._source = source
         self._offset = 0
         self._lineno = 1
         self._colno = 1
 
+        tokens = []
         while (token := self._next_token()) is not None:
-            yield token
-        yield EOF_TOKEN
+            tokens.append(token)
+        tokens.append(EOF_TOKEN)
+        return tokens
 
     def _next_token(self) -> Token | None:
-        while True:
+        source = self._source
+        source_length = len(source)
+        matchers_by_first_character = TOKEN_MATCHERS_BY_FIRST_CHARACTER
+        while self._offset < source_length:
+            offset = self._offset
+            character = source[offset]
             # skip whitespace
-            if re_match := re.match(WHITESPACE, self._truncated_source):
-                self._make_token(TokenType.WHITESPACE, re_match.group())
+            if character.isspace():
+                self._advance_position(cast(re.Match, WHITESPACE.match(source, offset)).group())
                 continue
             # skip line comment
-            if re_match := re.match(LINE_COMMENT, self._truncated_source):
-                self._make_token(TokenType.COMMENT, re_match.group())
+            if character == ";":
+                self._advance_position(cast(re.Match, LINE_COMMENT.match(source, offset)).group())
                 continue
             # TODO: handle multiline comments, need to keep track of recursion level
-            break
-
-        # return early if EOF
-        if len(self._truncated_source) == 0:
-            return None
 
-        # try to match each pattern
-        for pattern, token_type in TOKEN_PATTERNS:
-            if re_match := re.match(pattern, self._truncated_source):
-                return self._make_token(token_type, re_match.group())
+            # try to match each pattern that can start with the character
+            for match, token_type in matchers_by_first_character.get(character, OTHER_TOKEN_MATCHERS):
+                if re_match := match(source, offset):
+                    return self._make_token(token_type, re_match.group())
+            raise errors.UnrecognizedTokenError(offset)
 
-        raise errors.UnrecognizedTokenError(self._offset)
+        # EOF
+        return None
 
     def _make_token(self, token_type: TokenType, token_source: str) -> Token:
         # punctuators have different types
         if token_type is TokenType.DELIMITER:
-            if token_source in "([{":
-                token_type = TokenType.LPAREN
-            elif token_source in ")]}":
-                token_type = TokenType.RPAREN
-            elif token_source in "`":
-                token_type = TokenType.QUASIQUOTE
-            elif token_source in "'":
-                token_type = TokenType.QUOTE
-            elif token_source in ",":
-                token_type = TokenType.UNQUOTE
-            elif token_source in ",@":
-                token_type = TokenType.UNQUOTE_SPLICING
-
-        token = Token(type=token_type, offset=self._offset, lineno=self._lineno, colno=self._colno, source=token_source)
+            token_type = DELIMITER_TOKEN_TYPES[token_source]
+        # symbols repeat throughout a program and are used as lookup keys, so they share a single string
+        elif token_type is TokenType.SYMBOL:
+            token_source = sys.intern(token_source)
+
+        token = Token(token_type, self._offset, self._lineno, self._colno, token_source)
         self._advance_position(token_source)
-        self._truncate_source(len(token.source))
         return token
 
     def _advance_position(self, token_source: str) -> None:
         self._offset += len(token_source)
-        for character in token_source:
-            if character == "\n":
-                self._lineno += 1
-                self._colno = 1
-            else:
-                self._colno += 1
-
-    def _truncate_source(self, size: int) -> None:
-        self._truncated_source = self._truncated_source[size:]
+        newline_count = token_source.count("\n")
+        if newline_count > 0:
+            self._lineno += newline_count
+            self._colno = len(token_source) - token_source.rfind("\n")
+        else:
+            self._colno += len(token_source)
@@ -1,9 +1,8 @@
 """A parser for Racket programs."""
 from __future__ import annotations
 
-import re
-from collections.abc import Iterable
-from typing import Literal
+import sys
+from collections.abc import Callable, Iterable
 
 from mracket.reader import errors, lexer, syntax
 
@@ -31,18 +30,51 @@ QUOTE_RELATED_TOKEN_TYPE_NAME = {
     lexer.TokenType.UNQUOTE_SPLICING: "unquote-splicing",
 }
 
-DEFINITION = re.compile(r"define(-struct)?")
-TEST_CASE = re.compile(r"check-(expect|random|within|member-of|range|satisfied|error)")
-LIBRARY_REQUIRE = re.compile(r"require")
+# the token types the parser checks for, since looking up a member of an enum is slow compared to a global
+EOF = lexer.TokenType.EOF
+LPAREN = lexer.TokenType.LPAREN
+READER_DIRECTIVE = lexer.TokenType.READER_DIRECTIVE
+RPAREN = lexer.TokenType.RPAREN
+SYMBOL = lexer.TokenType.SYMBOL
+
+# the lexer interns symbols, so interning the special names lets the lookups compare them by identity
+TEST_CASE_NAMES = frozenset(sys.intern(typ.value) for typ in syntax.RacketTestCaseNode.Type)
+LIBRARY_REQUIRE_NAMES = frozenset(map(sys.intern, ("require",)))
 
 
 class Parser:
     """A parser for Racket programs."""
 
     def __init__(self) -> None:
-        self._token_stream: list[lexer.Token] = []
+        self._tokens: list[lexer.Token] = []
+        # index of the token after the current token
+        self._position = 0
         self._current_token = lexer.EOF_TOKEN
         self._lparen_stack: list[lexer.Token] = []
+        # parenthesized definitions, statements and expressions starting with a special name, by the name
+        self._definition_parsers: dict[str, Callable[[], syntax.RacketDefinitionNode]] = {
+            sys.intern("define"): self._name_definition,
+            sys.intern("define-struct"): self._structure_definition,
+        }
+        self._special_statement_parsers: dict[str, Callable[[], syntax.RacketStatementNode]] = {
+            **self._definition_parsers,
+            **{name: self._test_case for name in TEST_CASE_NAMES},
+            **{name: self._library_require for name in LIBRARY_REQUIRE_NAMES},
+        }
+        special_expression_parsers: dict[str, Callable[[], syntax.RacketExpressionNode]] = {
+            "cond": self._cond,
+            "if": self._if,
+            "\u03bb": self._lambda,
+            "lambda": self._lambda,
+            "letrec": self._let,
+            "let": self._let,
+            "let*": self._let,
+            "local": self._local,
+        }
+        self._special_expression_parsers = {
+            sys.intern(name): special_expression_parser
+            for name, special_expression_parser in special_expression_parsers.items()
+        }
 
     def parse(self, tokens: Iterable[lexer.Token]) -> syntax.RacketProgramNode:
         """Convert the tokens into a Racket program abstract syntax tree.
@@ -50,14 +82,13 @@ class Parser:
         :param tokens: Iterable collection of tokens
         :return: Racket program abstract syntax tree
         """
-        self._token_stream = list(tokens)
-        self._current_token = first_token = self._token_stream.pop(0)
-        self._lparen_stack = []
+        self._start(tokens)
+        first_token = self._current_token
 
         statements = []
         reader_directive = None
-        while self._current_token.type is not lexer.TokenType.EOF:
-            if self._current_token.type is lexer.TokenType.READER_DIRECTIVE:
+        while self._current_token.type is not EOF:
+            if self._current_token.type is READER_DIRECTIVE:
                 reader_directive = self._reader_directive()
             else:
                 statements.append(self._statement())
@@ -73,61 +104,77 @@ class Parser:
         :param tokens: Iterable collection of tokens
         :return: expresison abstract syntax tree
         """
-        self._token_stream = list(tokens)
-        self._current_token = self._token_stream.pop(0)
-        self._lparen_stack = []
+        self._start(tokens)
         return self._expression()
 
+    def parse_expressions(self, tokens: Iterable[lexer.Token]) -> list[syntax.RacketExpressionNode]:
+        """Convert the tokens into a sequence of expression abstract syntax trees.
+
+        :param tokens: Iterable collection of tokens
+        :return: List of expression abstract syntax trees
+        """
+        self._start(tokens)
+        expressions = []
+        while self._current_token.type is not EOF:
+            expressions.append(self._expression())
+        return expressions
+
+    def _start(self, tokens: Iterable[lexer.Token]) -> None:
+        # the parser never modifies the list of tokens, it only moves its position forward, so a list, such as the
+        # one the lexer returns, is used as is rather than copied
+        self._tokens = tokens if isinstance(tokens, list) else list(tokens)
+        self._current_token = self._tokens[0]
+        self._position = 1
+        self._lparen_stack = []
+
     def _reader_directive(self) -> syntax.RacketReaderDirectiveNode:
         node = syntax.RacketReaderDirectiveNode(token=self._current_token)
-        self._eat(lexer.TokenType.READER_DIRECTIVE)
+        self._eat(READER_DIRECTIVE)
         return node
 
     def _statement(self) -> syntax.RacketStatementNode:
-        if self._current_token.type is lexer.TokenType.EOF:
+        if self._current_token.type is EOF:
             raise errors.UnexpectedEOFTokenError(self._current_token)
-        if self._current_token.type is lexer.TokenType.RPAREN:
+        if self._current_token.type is RPAREN:
             raise errors.UnexpectedRightParenthesisError(self._current_token)
 
-        if self._is_definition_statement():
-            return self._definition()
-        if self._is_test_case_statement():
-            return self._test_case()
-        if self._is_library_require_statement():
-            return self._library_require()
+        if self._current_token.type is LPAREN and self._position < len(self._tokens):
+            next_token = self._tokens[self._position]
+            if next_token.type is SYMBOL:
+                special_statement_parser = self._special_statement_parsers.get(next_token.source)
+                if special_statement_parser is not None:
+                    return special_statement_parser()
         return self._expression()
 
     def _definition(self) -> syntax.RacketDefinitionNode:
-        if self._is_name_definition():
-            return self._name_definition()
-        elif self._is_structure_definition():
-            return self._structure_definition()
-        else:
+        definition_parser = self._definition_parsers.get(self._tokens[self._position].source)
+        if definition_parser is None:
             raise errors.IllegalStateError()
+        return definition_parser()
 
     def _name_definition(self) -> syntax.RacketNameDefinitionNode:
-        lparen = self._eat(lexer.TokenType.LPAREN)
-        self._eat(lexer.TokenType.SYMBOL)
-        if self._current_token.type is lexer.TokenType.LPAREN:
+        lparen = self._eat(LPAREN)
+        self._eat(SYMBOL)
+        if self._current_token.type is LPAREN:
             return self._desugar_function_definition(lparen)
-        elif self._current_token.type is lexer.TokenType.SYMBOL:
+        elif self._current_token.type is SYMBOL:
             name = self._name()
             expression = self._expression()
-            rparen = self._eat(lexer.TokenType.RPAREN)
+            rparen = self._eat(RPAREN)
             return syntax.RacketNameDefinitionNode(lparen=lparen, rparen=rparen, name=name, expression=expression)
         else:
             raise errors.IllegalStateError()
 
     def _desugar_function_definition(self, lparen: lexer.Token) -> syntax.RacketNameDefinitionNode:
         # desugar (define (name variable ...) expr) to (define name (lambda (variable ...) expr)
-        self._eat(lexer.TokenType.LPAREN)
+        self._eat(LPAREN)
         name = self._name()
         variables = []
-        while self._current_token.type is not lexer.TokenType.RPAREN:
+        while self._current_token.type is not RPAREN:
             variables.append(self._name())
-        self._eat(lexer.TokenType.RPAREN)
+        self._eat(RPAREN)
         expression = self._expression()
-        rparen = self._eat(lexer.TokenType.RPAREN)
+        rparen = self._eat(RPAREN)
         return syntax.RacketNameDefinitionNode(
             lparen=lparen,
             rparen=rparen,
@@ -141,48 +188,55 @@ class Parser:
         )
 
     def _structure_definition(self) -> syntax.RacketStructureDefinitionNode:
-        lparen = self._eat(lexer.TokenType.LPAREN)
-        self._eat(lexer.TokenType.SYMBOL)
+        lparen = self._eat(LPAREN)
+        self._eat(SYMBOL)
         name = self._name()
-        self._eat(lexer.TokenType.LPAREN)
+        self._eat(LPAREN)
         fields = []
-        while self._current_token.type is not lexer.TokenType.RPAREN:
+        while self._current_token.type is not RPAREN:
             fields.append(self._name())
-        self._eat(lexer.TokenType.RPAREN)
-        rparen = self._eat(lexer.TokenType.RPAREN)
+        self._eat(RPAREN)
+        rparen = self._eat(RPAREN)
         return syntax.RacketStructureDefinitionNode(lparen=lparen, rparen=rparen, name=name, fields=fields)
 
     def _expression(self) -> syntax.RacketExpressionNode:
-        token_type = self._current_token.type
-        if token_type in LITERAL_TOKEN_TYPES:
-            return self._literal()
-        elif token_type is lexer.TokenType.SYMBOL:
-            return self._name()
-
-        if token_type in QUOTE_RELATED_TOKEN_TYPES:
-            return self._desugar_quote_related()
-
-        if token_type is not lexer.TokenType.LPAREN:
-            raise errors.IllegalStateError(str(self._current_token))
-
-        if self._is_cond_expression():
-            return self._cond()
-        if self._is_if_expression():
-            return self._if()
-        if self._is_lambda_expression():
-            return self._lambda()
-        if self._is_let_expression():
-            return self._let()
-        if self._is_local_expression():
-            return self._local()
-
-        return self._procedure_application()
+        # procedure applications nest the deepest, so rather than by recursion, they are parsed with an explicit
+        # stack of the applications that are still open, each with the expressions parsed so far
+        applications: list[tuple[lexer.Token, list[syntax.RacketExpressionNode]]] = []
+        while True:
+            token_type = self._current_token.type
+            node: syntax.RacketExpressionNode
+            if token_type is RPAREN and len(applications) > 0:
+                lparen, expressions = applications.pop()
+                rparen = self._eat(RPAREN)
+                node = syntax.RacketProcedureApplicationNode(lparen=lparen, rparen=rparen, expressions=expressions)
+            elif token_type in LITERAL_TOKEN_TYPES:
+                node = self._literal()
+            elif token_type is SYMBOL:
+                node = self._name()
+            elif token_type in QUOTE_RELATED_TOKEN_TYPES:
+                node = self._desugar_quote_related()
+            elif token_type is not LPAREN:
+                raise errors.IllegalStateError(str(self._current_token))
+            else:
+                next_token = self._tokens[self._position]
+                special_expression_parser = (
+                    self._special_expression_parsers.get(next_token.source) if next_token.type is SYMBOL else None
+                )
+                if special_expression_parser is None:
+                    applications.append((self._eat(LPAREN), []))
+                    continue
+                node = special_expression_parser()
+
+            if len(applications) == 0:
+                return node
+            applications[-1][1].append(node)
 
     def _literal(self) -> syntax.RacketLiteralNode:
         return syntax.RacketLiteralNode(token=self._eat(self._current_token.type))
 
     def _name(self) -> syntax.RacketNameNode:
-        return syntax.RacketNameNode(token=self._eat(lexer.TokenType.SYMBOL))
+        return syntax.RacketNameNode(token=self._eat(SYMBOL))
 
     def _desugar_quote_related(self) -> syntax.RacketProcedureApplicationNode:
         quote_related_token_type = self._current_token.type
@@ -206,25 +260,25 @@ class Parser:
         )
 
     def _cond(self) -> syntax.RacketCondNode:
-        lparen = self._eat(lexer.TokenType.LPAREN)
-        self._eat(lexer.TokenType.SYMBOL)
+        lparen = self._eat(LPAREN)
+        self._eat(SYMBOL)
         branches = []
-        while self._current_token.type is not lexer.TokenType.RPAREN:
-            self._eat(lexer.TokenType.LPAREN)
+        while self._current_token.type is not RPAREN:
+            self._eat(LPAREN)
             branch = (self._expression(), self._expression())
-            self._eat(lexer.TokenType.RPAREN)
+            self._eat(RPAREN)
             branches.append(branch)
-        rparen = self._eat(lexer.TokenType.RPAREN)
+        rparen = self._eat(RPAREN)
         return syntax.RacketCondNode(lparen=lparen, rparen=rparen, branches=branches)
 
     def _if(self) -> syntax.RacketCondNode:
         # desugar (if expr expr expr) to (cond (expr expr) (else expr))
-        lparen = self._eat(lexer.TokenType.LPAREN)
-        self._eat(lexer.TokenType.SYMBOL)
+        lparen = self._eat(LPAREN)
+        self._eat(SYMBOL)
         condition = self._expression()
         true_expression = self._expression()
         false_expression = self._expression()
-        rparen = self._eat(lexer.TokenType.RPAREN)
+        rparen = self._eat(RPAREN)
         return syntax.RacketCondNode(
             lparen=lparen,
             rparen=rparen,
@@ -235,30 +289,30 @@ class Parser:
         )
 
     def _lambda(self) -> syntax.RacketLambdaNode:
-        lparen = self._eat(lexer.TokenType.LPAREN)
-        self._eat(lexer.TokenType.SYMBOL)
-        self._eat(lexer.TokenType.LPAREN)
+        lparen = self._eat(LPAREN)
+        self._eat(SYMBOL)
+        self._eat(LPAREN)
         variables = []
-        while self._current_token.type is not lexer.TokenType.RPAREN:
+        while self._current_token.type is not RPAREN:
             variables.append(self._name())
-        self._eat(lexer.TokenType.RPAREN)
+        self._eat(RPAREN)
         expression = self._expression()
-        rparen = self._eat(lexer.TokenType.RPAREN)
+        rparen = self._eat(RPAREN)
         return syntax.RacketLambdaNode(lparen=lparen, rparen=rparen, variables=variables, expression=expression)
 
     def _let(self) -> syntax.RacketLetNode:
-        lparen = self._eat(lexer.TokenType.LPAREN)
-        name = self._eat(lexer.TokenType.SYMBOL)
-        self._eat(lexer.TokenType.LPAREN)
+        lparen = self._eat(LPAREN)
+        name = self._eat(SYMBOL)
+        self._eat(LPAREN)
         local_definitions = []
-        while self._current_token.type is not lexer.TokenType.RPAREN:
-            self._eat(lexer.TokenType.LPAREN)
+        while self._current_token.type is not RPAREN:
+            self._eat(LPAREN)
             local_definition = (self._name(), self._expression())
-            self._eat(lexer.TokenType.RPAREN)
+            self._eat(RPAREN)
             local_definitions.append(local_definition)
-        self._eat(lexer.TokenType.RPAREN)
+        self._eat(RPAREN)
         expression = self._expression()
-        rparen = self._eat(lexer.TokenType.RPAREN)
+        rparen = self._eat(RPAREN)
         return syntax.RacketLetNode(
             lparen=lparen,
             rparen=rparen,
@@ -268,96 +322,47 @@ class Parser:
         )
 
     def _local(self) -> syntax.RacketLocalNode:
-        lparen = self._eat(lexer.TokenType.LPAREN)
-        self._eat(lexer.TokenType.SYMBOL)
-        self._eat(lexer.TokenType.LPAREN)
+        lparen = self._eat(LPAREN)
+        self._eat(SYMBOL)
+        self._eat(LPAREN)
         definitions = []
-        while self._current_token.type is not lexer.TokenType.RPAREN:
+        while self._current_token.type is not RPAREN:
             definitions.append(self._definition())
-        self._eat(lexer.TokenType.RPAREN)
+        self._eat(RPAREN)
         expression = self._expression()
-        rparen = self._eat(lexer.TokenType.RPAREN)
+        rparen = self._eat(RPAREN)
         return syntax.RacketLocalNode(lparen=lparen, rparen=rparen, definitions=definitions, expression=expression)
 
-    def _procedure_application(self) -> syntax.RacketProcedureApplicationNode:
-        lparen = self._eat(lexer.TokenType.LPAREN)
-        expressions = []
-        while self._current_token.type is not lexer.TokenType.RPAREN:
-            expressions.append(self._expression())
-        rparen = self._eat(lexer.TokenType.RPAREN)
-        return syntax.RacketProcedureApplicationNode(lparen=lparen, rparen=rparen, expressions=expressions)
-
     def _test_case(self) -> syntax.RacketTestCaseNode:
-        lparen = self._eat(lexer.TokenType.LPAREN)
-        name = self._eat(lexer.TokenType.SYMBOL)
+        lparen = self._eat(LPAREN)
+        name = self._eat(SYMBOL)
         expressions = []
-        while self._current_token.type is not lexer.TokenType.RPAREN:
+        while self._current_token.type is not RPAREN:
             expressions.append(self._expression())
-        rparen = self._eat(lexer.TokenType.RPAREN)
+        rparen = self._eat(RPAREN)
         return syntax.RacketTestCaseNode(
             lparen=lparen, rparen=rparen, typ=syntax.RacketTestCaseNode.Type(name.source), expressions=expressions
         )
 
     def _library_require(self) -> syntax.RacketLibraryRequireNode:
-        lparen = self._eat(lexer.TokenType.LPAREN)
-        self._eat(lexer.TokenType.SYMBOL)
+        lparen = self._eat(LPAREN)
+        self._eat(SYMBOL)
         library = self._name()
-        rparen = self._eat(lexer.TokenType.RPAREN)
+        rparen = self._eat(RPAREN)
         return syntax.RacketLibraryRequireNode(lparen=lparen, rparen=rparen, library=library)
 
     def _eat(self, token_type: lexer.TokenType) -> lexer.Token:
         if self._current_token.type != token_type:
             raise errors.ParserError(self._current_token)
 
-        if token_type is lexer.TokenType.LPAREN:
+        if token_type is LPAREN:
             self._lparen_stack.append(self._current_token)
-        elif token_type is lexer.TokenType.RPAREN:
+        elif token_type is RPAREN:
             lparen = self._lparen_stack.pop()
             if self._current_token.source != MATCHING_PARENS[lparen.source]:
                 raise errors.MismatchedParenthesesError(lparen, self._current_token)
 
         previous_token = self._current_token
-        self._current_token = self._token_stream.pop(0)
+        self._current_token = self._tokens[self._position]
+        self._position += 1
         return previous_token
-
-    def _is_definition_statement(self) -> str | Literal[False]:
-        return self._is_special_statement(DEFINITION)
-
-    def _is_test_case_statement(self) -> str | Literal[False]:
-        return self._is_special_statement(TEST_CASE)
-
-    def _is_library_require_statement(self) -> str | Literal[False]:
-        return self._is_special_statement(LIBRARY_REQUIRE)
-
-    def _is_special_statement(self, pattern: re.Pattern) -> str | Literal[False]:
-        if not (self._current_token.type is lexer.TokenType.LPAREN and len(self._token_stream) > 0):
-            return False
-        next_token = self._token_stream[0]
-        if next_token.type is lexer.TokenType.SYMBOL and re.match(pattern, next_token.source):
-            return next_token.source
-        return False
-
-    def _is_name_definition(self) -> bool:
-        return self._token_stream[0].source == "define"
-
-    def _is_structure_definition(self) -> bool:
-        return self._token_stream[0].source == "define-struct"
-
-    def _is_cond_expression(self) -> bool:
-        return self._is_special_expression("cond")
-
-    def _is_if_expression(self) -> bool:
-        return self._is_special_expression("if")
-
-    def _is_lambda_expression(self) -> bool:
-        return self._is_special_expression("\u03bb", "lambda")
-
-    def _is_let_expression(self) -> bool:
-        return self._is_special_expression("letrec", "let", "let*")
-
-    def _is_local_expression(self) -> bool:
-        return self._is_special_expression("local")
-
-    def _is_special_expression(self, *names: str) -> bool:
-        next_token = self._token_stream[0]
-        return next_token.type is lexer.TokenType.SYMBOL and next_token.source in names
@@ -23,9 +23,39 @@ from mracket.reader import lexer, parser, syntax
         [syntax.RacketLetNode, "(let ((x 1)) x)"],
         [syntax.RacketLocalNode, "(local ((define x 1)) x)"],
         [syntax.RacketLibraryRequireNode, "(require 2htdp/universe)"],
+        [syntax.RacketTestCaseNode, "(check-member-of 1 1 2)"],
+        [syntax.RacketProcedureApplicationNode, "(defined x)"],
+        [syntax.RacketProcedureApplicationNode, "(check-expected 1 1)"],
     ],
 )
 def test_parse_node_type(typ: type, source: str) -> None:
     tokens = lexer.Lexer().tokenize(f"#lang racket\n{source}")
     program = parser.Parser().parse(tokens)
     assert isinstance(program.statements[0], typ)
+
+
+def test_parse_expressions() -> None:
+    tokens = lexer.Lexer().tokenize("1\n(+ 1 2)\nidentity")
+    expressions = parser.Parser().parse_expressions(tokens)
+    assert [type(expression) for expression in expressions] == [
+        syntax.RacketLiteralNode,
+        syntax.RacketProcedureApplicationNode,
+        syntax.RacketNameNode,
+    ]
+
+
+def test_parse_deeply_nested_procedure_applications() -> None:
+    depth = 10_000
+    tokens = lexer.Lexer().tokenize("(f " * depth + "1" + ")" * depth)
+    expression = parser.Parser().parse_expression(tokens)
+    for _ in range(depth):
+        assert isinstance(expression, syntax.RacketProcedureApplicationNode)
+        expression = expression.expressions[1]
+    assert isinstance(expression, syntax.RacketLiteralNode)
+
+
+def test_parse_does_not_modify_tokens() -> None:
+    tokens = lexer.Lexer().tokenize("#lang racket\n(define (f x) (+ x 1))")
+    original_tokens = tokens.copy()
+    parser.Parser().parse(tokens)
+    assert tokens == original_tokens
@@ -1,53 +1,178 @@
 """Stringify a Racket abstract syntax tree."""
 from __future__ import annotations
 
+import itertools
+from collections.abc import Sequence
+
 from mracket.reader import syntax
 
+# nodes whose source is exactly the source of their token
+LEAF_NODE_TYPES = frozenset({syntax.RacketReaderDirectiveNode, syntax.RacketLiteralNode, syntax.RacketNameNode})
+
 
 class Stringifier(syntax.RacketASTVisitor):
-    """Stringifier of a Racket abstract syntax tree."""
+    """Stringifier of a Racket abstract syntax tree.
+
+    A stringifier keeps no state between calls, so a single stringifier can be shared,
+    even between threads.
+    """
+
+    def visit(self, node: syntax.RacketASTNode) -> str:
+        writer = _SourceWriter()
+        writer.write(node)
+        return writer.source()
+
+    def visit_with_spans(self, node: syntax.RacketASTNode) -> tuple[str, dict[int, tuple[int, int]]]:
+        """Stringify the node and record the span of each node in the resulting source.
+
+        :param node: A Racket AST node
+        :return: The source, and a mapping from the id of each node to its start and end offsets
+        """
+        writer = _SourceWriter(record_spans=True)
+        writer.write(node)
+        return writer.source(), writer.spans()
 
     def visit_program_node(self, node: syntax.RacketProgramNode) -> str:
-        return self.visit(node.reader_directive) + "\n" + "\n".join(map(self.visit, node.statements))
+        return self.visit(node)
 
     def visit_reader_directive_node(self, node: syntax.RacketReaderDirectiveNode) -> str:
-        return node.token.source
+        return self.visit(node)
 
     def visit_name_definition_node(self, node: syntax.RacketNameDefinitionNode) -> str:
-        return f"(define {self.visit(node.name)} {self.visit(node.expression)})"
+        return self.visit(node)
 
     def visit_structure_definition_node(self, node: syntax.RacketStructureDefinitionNode) -> str:
-        return f"(define-struct {self.visit(node.name)} ({' '.join(map(self.visit, node.fields))}))"
+        return self.visit(node)
 
     def visit_literal_node(self, node: syntax.RacketLiteralNode) -> str:
-        return node.token.source
+        return self.visit(node)
 
     def visit_name_node(self, node: syntax.RacketNameNode) -> str:
-        return node.token.source
+        return self.visit(node)
 
     def visit_cond_node(self, node: syntax.RacketCondNode) -> str:
-        branches = " ".join(
-            f"({self.visit(condition)} {self.visit(expression)})" for condition, expression in node.branches
-        )
-        return f"(cond {branches})"
+        return self.visit(node)
 
     def visit_lambda_node(self, node: syntax.RacketLambdaNode) -> str:
-        return f"(lambda ({' '.join(map(self.visit, node.variables))}) {self.visit(node.expression)})"
+        return self.visit(node)
 
     def visit_let_node(self, node: syntax.RacketLetNode) -> str:
-        local_definitions = " ".join(
-            f"({self.visit(name)} {self.visit(expression)})" for name, expression in node.local_definitions
-        )
-        return f"({node.type.value} ({local_definitions}) {self.visit(node.expression)})"
+        return self.visit(node)
 
     def visit_local_node(self, node: syntax.RacketLocalNode) -> str:
-        return f"(local ({' '.join(map(self.visit, node.definitions))}) {self.visit(node.expression)})"
+        return self.visit(node)
 
     def visit_procedure_application_node(self, node: syntax.RacketProcedureApplicationNode) -> str:
-        return f"({' '.join(map(self.visit, node.expressions))})"
+        return self.visit(node)
 
     def visit_test_case_node(self, node: syntax.RacketTestCaseNode) -> str:
-        return f"({node.type.value} {' '.join(map(self.visit, node.expressions))})"
+        return self.visit(node)
 
     def visit_library_require_node(self, node: syntax.RacketLibraryRequireNode) -> str:
-        return f"(require {self.visit(node.library)})"
+        return self.visit(node)
+
+
+class _SourceWriter(syntax.RacketASTVisitor):
+    """Writes the source of a single Racket abstract syntax tree.
+
+    The fragments of the source are accumulated in a list and joined once, so that the
+    position of every node in the source can optionally be recorded along the way.
+
+    The tree is walked with an explicit stack rather than by recursion, so that the
+    source of any tree the parser builds can be written. Visiting a node returns the
+    parts of its source in order, each either a fragment or a child node.
+    """
+
+    def __init__(self, record_spans: bool = False) -> None:
+        self._fragments: list[str] = []
+        self._fragment_spans: dict[int, tuple[int, int]] | None = {} if record_spans else None
+
+    def source(self) -> str:
+        return "".join(self._fragments)
+
+    def spans(self) -> dict[int, tuple[int, int]]:
+        assert self._fragment_spans is not None
+        offsets = [0, *itertools.accumulate(map(len, self._fragments))]
+        return {node_id: (offsets[start], offsets[end]) for node_id, (start, end) in self._fragment_spans.items()}
+
+    def write(self, node: syntax.RacketASTNode) -> None:
+        fragments, fragment_spans = self._fragments, self._fragment_spans
+        # the parts still to write, in reverse, along with the id and first fragment of each node whose span is open
+        stack: list[str | syntax.RacketASTNode | tuple[int, int]] = [node]
+        while len(stack) > 0:
+            part = stack.pop()
+            if type(part) is str:
+                fragments.append(part)
+            elif type(part) is tuple:
+                assert fragment_spans is not None
+                node_id, start = part
+                fragment_spans[node_id] = (start, len(fragments))
+            # most nodes are leaves, which are written without dispatching on the visitor
+            elif type(part) in LEAF_NODE_TYPES:
+                if fragment_spans is not None:
+                    fragment_spans[id(part)] = (len(fragments), len(fragments) + 1)
+                fragments.append(part.token.source)  # type: ignore[union-attr]
+            else:
+                if fragment_spans is not None:
+                    stack.append((id(part), len(fragments)))
+                stack.extend(reversed(part.accept_visitor(self)))  # type: ignore[union-attr]
+
+    def visit_program_node(self, node: syntax.RacketProgramNode) -> list[str | syntax.RacketASTNode]:
+        return [node.reader_directive, "\n", *_separated(node.statements, "\n")]
+
+    def visit_reader_directive_node(self, node: syntax.RacketReaderDirectiveNode) -> list[str | syntax.RacketASTNode]:
+        return [node.token.source]
+
+    def visit_name_definition_node(self, node: syntax.RacketNameDefinitionNode) -> list[str | syntax.RacketASTNode]:
+        return ["(define ", node.name, " ", node.expression, ")"]
+
+    def visit_structure_definition_node(
+        self, node: syntax.RacketStructureDefinitionNode
+    ) -> list[str | syntax.RacketASTNode]:
+        return ["(define-struct ", node.name, " (", *_separated(node.fields), "))"]
+
+    def visit_literal_node(self, node: syntax.RacketLiteralNode) -> list[str | syntax.RacketASTNode]:
+        return [node.token.source]
+
+    def visit_name_node(self, node: syntax.RacketNameNode) -> list[str | syntax.RacketASTNode]:
+        return [node.token.source]
+
+    def visit_cond_node(self, node: syntax.RacketCondNode) -> list[str | syntax.RacketASTNode]:
+        parts: list[str | syntax.RacketASTNode] = ["(cond "]
+        for i, (condition, expression) in enumerate(node.branches):
+            parts += [" (" if i > 0 else "(", condition, " ", expression, ")"]
+        parts.append(")")
+        return parts
+
+    def visit_lambda_node(self, node: syntax.RacketLambdaNode) -> list[str | syntax.RacketASTNode]:
+        return ["(lambda (", *_separated(node.variables), ") ", node.expression, ")"]
+
+    def visit_let_node(self, node: syntax.RacketLetNode) -> list[str | syntax.RacketASTNode]:
+        parts: list[str | syntax.RacketASTNode] = [f"({node.type.value} ("]
+        for i, (name, expression) in enumerate(node.local_definitions):
+            parts += [" (" if i > 0 else "(", name, " ", expression, ")"]
+        parts += [") ", node.expression, ")"]
+        return parts
+
+    def visit_local_node(self, node: syntax.RacketLocalNode) -> list[str | syntax.RacketASTNode]:
+        return ["(local (", *_separated(node.definitions), ") ", node.expression, ")"]
+
+    def visit_procedure_application_node(
+        self, node: syntax.RacketProcedureApplicationNode
+    ) -> list[str | syntax.RacketASTNode]:
+        return ["(", *_separated(node.expressions), ")"]
+
+    def visit_test_case_node(self, node: syntax.RacketTestCaseNode) -> list[str | syntax.RacketASTNode]:
+        return [f"({node.type.value} ", *_separated(node.expressions), ")"]
+
+    def visit_library_require_node(self, node: syntax.RacketLibraryRequireNode) -> list[str | syntax.RacketASTNode]:
+        return ["(require ", node.library, ")"]
+
+
+def _separated(nodes: Sequence[syntax.RacketASTNode], separator: str = " ") -> list[str | syntax.RacketASTNode]:
+    parts: list[str | syntax.RacketASTNode] = []
+    for i, node in enumerate(nodes):
+        if i > 0:
+            parts.append(separator)
+        parts.append(node)
+    return parts
@@ -0,0 +1,26 @@
+"""Tests for mracket.reader.stringify."""
+from __future__ import annotations
+
+import concurrent.futures
+
+from mracket.reader import lexer, parser, syntax
+from mracket.reader.stringify import Stringifier
+
+
+def test_visit_node_returns_source() -> None:
+    program = parser.Parser().parse(lexer.Lexer().tokenize("#lang racket\n(define f (lambda (x) (+ x 1)))"))
+    stringifier = Stringifier()
+    definition = program.statements[0]
+    assert isinstance(definition, syntax.RacketNameDefinitionNode)
+
+    assert stringifier.visit_program_node(program) == "#lang racket\n(define f (lambda (x) (+ x 1)))"
+    assert stringifier.visit_name_definition_node(definition) == "(define f (lambda (x) (+ x 1)))"
+
+
+def test_shared_stringifier() -> None:
+    sources = [f"#lang racket\n(define x{i} (+ {i} 1))" for i in range(100)]
+    programs = [parser.Parser().parse(lexer.Lexer().tokenize(source)) for source in sources]
+    stringifier = Stringifier()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        assert list(executor.map(stringifier.visit, programs)) == sources
@@ -122,6 +122,8 @@ class RacketASTVisitor(metaclass=abc.ABCMeta):
 class RacketASTNode(metaclass=abc.ABCMeta):
     """An AST node."""
 
+    __slots__ = ("token",)
+
     def __init__(self, token: lexer.Token) -> None:
         self.token = token
 
@@ -137,6 +139,8 @@ class RacketASTNode(metaclass=abc.ABCMeta):
 class RacketProgramNode(RacketASTNode):
     """A program node."""
 
+    __slots__ = ("reader_directive", "statements")
+
     def __init__(
         self, token: lexer.Token, reader_directive: RacketReaderDirectiveNode, statements: list[RacketStatementNode]
     ) -> None:
@@ -151,6 +155,8 @@ class RacketProgramNode(RacketASTNode):
 class RacketReaderDirectiveNode(RacketASTNode):
     """A reader directive node."""
 
+    __slots__ = ()
+
     def accept_visitor(self, visitor: RacketASTVisitor) -> Any:
         return visitor.visit_reader_directive_node(self)
 
@@ -158,10 +164,14 @@ class RacketReaderDirectiveNode(RacketASTNode):
 class RacketStatementNode(RacketASTNode, metaclass=abc.ABCMeta):
     """A statement node."""
 
+    __slots__ = ()
+
 
 class RacketDefinitionNode(RacketStatementNode, metaclass=abc.ABCMeta):
     """A definition node."""
 
+    __slots__ = ("lparen", "rparen", "name")
+
     def __init__(self, lparen: lexer.Token, rparen: lexer.Token, name: RacketNameNode) -> None:
         super().__init__(lparen)
         self.lparen = lparen
@@ -172,6 +182,8 @@ class RacketDefinitionNode(RacketStatementNode, metaclass=abc.ABCMeta):
 class RacketNameDefinitionNode(RacketDefinitionNode):
     """A name definition node."""
 
+    __slots__ = ("expression",)
+
     def __init__(
         self, lparen: lexer.Token, rparen: lexer.Token, name: RacketNameNode, expression: RacketExpressionNode
     ):
@@ -185,6 +197,8 @@ class RacketNameDefinitionNode(RacketDefinitionNode):
 class RacketStructureDefinitionNode(RacketDefinitionNode):
     """A structure definition node."""
 
+    __slots__ = ("fields",)
+
     def __init__(self, lparen: lexer.Token, rparen: lexer.Token, name: RacketNameNode, fields: list[RacketNameNode]):
         super().__init__(lparen, rparen, name)
         self.fields = fields
@@ -196,10 +210,14 @@ class RacketStructureDefinitionNode(RacketDefinitionNode):
 class RacketExpressionNode(RacketStatementNode, metaclass=abc.ABCMeta):
     """An expression node."""
 
+    __slots__ = ()
+
 
 class RacketLiteralNode(RacketExpressionNode):
     """A literal."""
 
+    __slots__ = ()
+
     def accept_visitor(self, visitor: RacketASTVisitor) -> Any:
         return visitor.visit_literal_node(self)
 
@@ -207,6 +225,8 @@ class RacketLiteralNode(RacketExpressionNode):
 class RacketNameNode(RacketExpressionNode):
     """A name node."""
 
+    __slots__ = ()
+
     def accept_visitor(self, visitor: RacketASTVisitor) -> Any:
         return visitor.visit_name_node(self)
 
@@ -217,6 +237,8 @@ class RacketSExprNode(RacketExpressionNode, metaclass=abc.ABCMeta):
     Starts with a left parenthesis and ends with a right parenthesis.
     """
 
+    __slots__ = ("lparen", "rparen")
+
     def __init__(self, lparen: lexer.Token, rparen: lexer.Token) -> None:
         super().__init__(lparen)
         self.lparen = lparen
@@ -226,6 +248,8 @@ class RacketSExprNode(RacketExpressionNode, metaclass=abc.ABCMeta):
 class RacketCondNode(RacketSExprNode):
     """A cond node."""
 
+    __slots__ = ("branches",)
+
     def __init__(
         self,
         lparen: lexer.Token,
@@ -242,6 +266,8 @@ class RacketCondNode(RacketSExprNode):
 class RacketLambdaNode(RacketSExprNode):
     """A lambda node."""
 
+    __slots__ = ("variables", "expression")
+
     def __init__(
         self,
         lparen: lexer.Token,
@@ -260,6 +286,8 @@ class RacketLambdaNode(RacketSExprNode):
 class RacketLetNode(RacketSExprNode):
     """A let node."""
 
+    __slots__ = ("type", "local_definitions", "expression")
+
     class Type(enum.Enum):
         """The type of let node."""
 
@@ -287,6 +315,8 @@ class RacketLetNode(RacketSExprNode):
 class RacketLocalNode(RacketSExprNode):
     """A local node."""
 
+    __slots__ = ("definitions", "expression")
+
     def __init__(
         self,
         lparen: lexer.Token,
@@ -305,6 +335,8 @@ class RacketLocalNode(RacketSExprNode):
 class RacketProcedureApplicationNode(RacketSExprNode):
     """A procedure application node."""
 
+    __slots__ = ("expressions",)
+
     def __init__(self, lparen: lexer.Token, rparen: lexer.Token, expressions: list[RacketExpressionNode]) -> None:
         super().__init__(lparen, rparen)
         self.expressions = expressions
@@ -316,13 +348,15 @@ class RacketProcedureApplicationNode(RacketSExprNode):
 class RacketTestCaseNode(RacketStatementNode):
     """A test case node."""
 
+    __slots__ = ("lparen", "rparen", "type", "expressions")
+
     class Type(enum.Enum):
         """The type of test case node."""
 
         CHECK_EXPECT = "check-expect"
         CHECK_RANDOM = "check-random"
         CHECK_WITHIN = "check-within"
-        CHECK_MEMBER = "check-member"
+        CHECK_MEMBER_OF = "check-member-of"
         CHECK_RANGE = "check-range"
         CHECK_SATISFIED = "check-satisfied"
         CHECK_ERROR = "check-error"
@@ -347,6 +381,8 @@ class RacketTestCaseNode(RacketStatementNode):
 class RacketLibraryRequireNode(RacketStatementNode):
     """A library require node."""
 
+    __slots__ = ("lparen", "rparen", "library")
+
     def __init__(self, lparen: lexer.Token, rparen: lexer.Token, library: RacketNameNode) -> None:
         super().__init__(lparen)
         self.lparen = lparen
@@ -1,16 +1,19 @@
 """The mutation testing runner."""
 from __future__ import annotations
 
+import collections
+import concurrent.futures
+import functools
 import os.path
+import shutil
 import subprocess
 import tempfile
-import time
 import uuid
-from collections.abc import Generator, Iterator
+from collections.abc import Collection, Generator, Iterator
 from typing import cast
 
 from mracket import mutation, reader
-from mracket.mutation import applier, mutator
+from mracket.mutation import applier, mutator, reachability
 from mracket.reader import lexer, parser, syntax
 from mracket.runner import logger, output, result
 
@@ -18,15 +21,29 @@ DRRACKET_PREFIX = ";; The first three lines of this file were inserted by DrRack
 PROGRAM_SUFFIX = "(require test-engine/racket-tests)\n(test)"
 
 
+@functools.lru_cache(maxsize=None)
+def racket_executable() -> str:
+    """Find the absolute path of the Racket executable.
+
+    :return: Path of the Racket executable
+    """
+    executable = shutil.which("racket")
+    if executable is None:
+        raise FileNotFoundError("Cannot find the Racket executable")
+    return os.path.abspath(executable)
+
+
 class Runner:
     """Runs a set of mutations on a file."""
 
-    MAX_PROCESS_COUNT = BATCH_SIZE = 100
     DIR = tempfile.gettempdir()
 
-    def __init__(self, mutator_: mutator.Mutator, filepath: str) -> None:
+    def __init__(self, mutator_: mutator.Mutator, filepath: str, jobs: int | None = None) -> None:
         self.mutator = mutator_
         self.filepath = filepath
+        if jobs is not None and jobs < 1:
+            raise ValueError(f"jobs must be positive, got {jobs}")
+        self.jobs = (os.cpu_count() or 1) if jobs is None else jobs
 
         self.result: result.RunnerResult = cast(result.RunnerResult, None)
 
@@ -41,7 +58,13 @@ class Runner:
             program = self.build_syntax_tree(source)
             success.mutations = self.generate_mutations(self.mutator, program)
             mutants = self.apply_mutations(program, success.mutations)
-            success.mutant_results = self.run_mutants(mutants)
+            success.mutant_results = self.run_mutants(
+                mutants,
+                self.jobs,
+                unreachable_nodes=reachability.unreachable_nodes(program),
+                defined_value_names=reachability.defined_value_names(program),
+                unmodified_stdout=success.unmodified_result.stdout,
+            )
             self.result = success
         except result.RunnerFailure as e:
             e.filepath = self.filepath
@@ -71,12 +94,10 @@ class Runner:
         """
         logger.LOGGER.debug("Running the unmodified program")
         program = TemporaryRacketProgram(source)
-        while True:
-            if program.finished:
-                program.delete()
-                break
-            time.sleep(0.1)
-        stdout, stderr = program.result
+        try:
+            stdout, stderr = program.wait()
+        finally:
+            program.delete()
         if program.returncode != 0 or len(stderr) > 0:
             raise result.RunnerFailure(
                 reason=result.RunnerFailure.Reason.NON_ZERO_UNMODIFIED_RETURNCODE,
@@ -89,9 +110,13 @@ class Runner:
         return unmodified_result
 
     @staticmethod
+    @functools.lru_cache(maxsize=16)
     def build_syntax_tree(source: str) -> syntax.RacketProgramNode:
         """Build an abstract syntax tree of the Racket program.
 
+        Syntax trees are never modified once built, so they are cached by source and
+        shared between runs on the same program.
+
         :param source: Racket program source
         :return: A program abstract syntax tree
         """
@@ -134,73 +159,97 @@ class Runner:
         return mutants
 
     @staticmethod
-    def run_mutants(mutants: Iterator[mutation.Mutant]) -> Generator[output.MutantOutput, None, None]:
+    def run_mutants(
+        mutants: Iterator[mutation.Mutant],
+        jobs: int = 1,
+        unreachable_nodes: Collection[int] = frozenset(),
+        defined_value_names: Collection[str] = frozenset(),
+        unmodified_stdout: str = "",
+    ) -> Generator[output.MutantOutput, None, None]:
         """Run the mutants.
 
+        The mutants are run concurrently by a pool of workers, but the results are
+        yielded in the same order as the mutants. A mutant identical to one that was
+        already run reuses its output.
+
+        A mutant that replaces an expression that can never be evaluated is not run
+        if its replacement is a literal or a name the program defines as a value rather
+        than a function, since such a replacement still compiles, and so its output is
+        the same as the unmodified program. Any other replacement may not compile, so
+        the mutant is run.
+
         :param mutants: An iterator of mutants pairs
+        :param jobs: Maximum number of mutants to run at once
+        :param unreachable_nodes: Ids of the operand expressions that can never be evaluated
+        :param defined_value_names: Names defined by the top-level definitions of the program that are not functions
+        :param unmodified_stdout: Output of the unmodified program
         :return: Generator of mutant execution results
         """
         logger.LOGGER.debug("Running the mutated programs")
-        process_count = 0
-        running_programs = []
-        while True:
-            try:
-                # TODO: fix output to be deterministic
-                if process_count < Runner.MAX_PROCESS_COUNT:
-                    mutant = next(mutants)
-                    program = TemporaryRacketProgram(mutant.source, mutant.mutation)
-                    running_programs.append(program)
-
-                for program in running_programs:
-                    try:
-                        if program.finished:
-                            running_programs.remove(program)
-                            program.delete()
-                            stdout, stderr = program.result
-                            yield output.MutantOutput(
-                                mut=cast(mutation.Mutation, program.mut),
-                                returncode=program.returncode,
-                                stdout=stdout.decode("utf-8"),
-                                stderr=stderr.decode("utf-8"),
-                            )
-                    except result.RunnerFailure as e:
-                        running_programs.remove(program)
-                        program.delete()
-                        yield output.MutantOutput(
-                            mut=cast(mutation.Mutation, program.mut),
-                            returncode=program.returncode,
-                            stderr=e.reason.value,
-                        )
-
-                time.sleep(0.1)
-            except StopIteration:
-                break
-
-        while len(running_programs) > 0:
-            # duplicate of code above
-            # TODO: consider if possible to abstract out duplication
-            for program in running_programs:
-                try:
-                    if program.finished:
-                        running_programs.remove(program)
-                        program.delete()
-                        stdout, stderr = program.result
-                        yield output.MutantOutput(
-                            mut=cast(mutation.Mutation, program.mut),
-                            returncode=program.returncode,
-                            stdout=stdout.decode("utf-8"),
-                            stderr=stderr.decode("utf-8"),
-                        )
-                except result.RunnerFailure as e:
-                    running_programs.remove(program)
-                    program.delete()
-                    yield output.MutantOutput(
-                        mut=cast(mutation.Mutation, program.mut),
-                        returncode=program.returncode,
-                        stderr=e.reason.value,
-                    )
-
-            time.sleep(0.1)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+            # bound the number of pending mutants so that they are not all held in memory at once
+            pending: collections.deque[
+                tuple[mutation.Mutation, concurrent.futures.Future[output.MutantOutput]]
+            ] = collections.deque()
+            # the mutants are patches of the same source, so mutants with the same patch are identical
+            runs: dict[tuple[int, int, str], concurrent.futures.Future[output.MutantOutput]] = {}
+            for mutant in mutants:
+                if id(mutant.mutation.original) in unreachable_nodes and Runner._always_compiles(
+                    mutant.mutation.replacement, defined_value_names
+                ):
+                    future: concurrent.futures.Future[output.MutantOutput] = concurrent.futures.Future()
+                    future.set_result(output.MutantOutput(mut=mutant.mutation, returncode=0, stdout=unmodified_stdout))
+                else:
+                    patch = (mutant.start, mutant.end, mutant.replacement_source)
+                    if patch not in runs:
+                        runs[patch] = executor.submit(Runner.run_mutant, mutant)
+                    future = runs[patch]
+                pending.append((mutant.mutation, future))
+                if len(pending) >= 2 * jobs:
+                    yield Runner._mutant_output(*pending.popleft())
+            while len(pending) > 0:
+                yield Runner._mutant_output(*pending.popleft())
+
+    @staticmethod
+    def _always_compiles(replacement: syntax.RacketASTNode, defined_value_names: Collection[str]) -> bool:
+        # a literal, or a name bound to a value at the top-level, is a valid operand wherever an operand is, while a
+        # name bound to a function is a syntax error outside of an operator in the teaching languages
+        if isinstance(replacement, syntax.RacketLiteralNode):
+            return True
+        return isinstance(replacement, syntax.RacketNameNode) and replacement.token.source in defined_value_names
+
+    @staticmethod
+    def _mutant_output(
+        mut: mutation.Mutation, future: concurrent.futures.Future[output.MutantOutput]
+    ) -> output.MutantOutput:
+        mutant_output = future.result()
+        if mutant_output.mutation is not mut:
+            # the result is of an identical mutant that was run instead
+            mutant_output = output.MutantOutput(
+                mut=mut, returncode=mutant_output.returncode, stdout=mutant_output.stdout, stderr=mutant_output.stderr
+            )
+        return mutant_output
+
+    @staticmethod
+    def run_mutant(mutant: mutation.Mutant) -> output.MutantOutput:
+        """Run a mutant.
+
+        :param mutant: A mutant
+        :return: Result of running the mutant
+        """
+        program = TemporaryRacketProgram(mutant.source, mutant.mutation)
+        try:
+            stdout, stderr = program.wait()
+        except result.RunnerFailure as e:
+            return output.MutantOutput(mut=mutant.mutation, returncode=program.returncode, stderr=e.reason.value)
+        finally:
+            program.delete()
+        return output.MutantOutput(
+            mut=mutant.mutation,
+            returncode=program.returncode,
+            stdout=stdout.decode("utf-8"),
+            stderr=stderr.decode("utf-8"),
+        )
 
 
 class TemporaryRacketProgram:
@@ -214,22 +263,23 @@ class TemporaryRacketProgram:
         self.filepath = os.path.join(self.DIR, str(uuid.uuid4()))
         with open(self.filepath, "w") as f:
             f.write(f"{self.source}\n{PROGRAM_SUFFIX}")
-        self.process = subprocess.Popen(["racket", self.filepath], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        self.starttime = time.time()
+        # with an absolute executable path and close_fds disabled, the process can be spawned with posix_spawn
+        # instead of fork and exec; the descriptors of this process are non-inheritable, so none are leaked
+        self.process = subprocess.Popen(
+            [racket_executable(), self.filepath], stdout=subprocess.PIPE, stderr=subprocess.PIPE, close_fds=False
+        )
 
     @property
     def returncode(self) -> int:
         return self.process.returncode
 
-    @property
-    def finished(self) -> bool:
-        if time.time() - self.starttime > self.TIMEOUT:
+    def wait(self) -> tuple[bytes, bytes]:
+        try:
+            return self.process.communicate(timeout=self.TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.communicate()
             raise result.RunnerFailure(reason=result.RunnerFailure.Reason.TIMEOUT)
-        return self.process.poll() is not None
-
-    @property
-    def result(self) -> tuple[bytes, bytes]:
-        return self.process.communicate()
 
     # TODO: better name for method?
     def delete(self) -> None:
@@ -0,0 +1,68 @@
+"""Tests for mracket.runner."""
+from __future__ import annotations
+
+import pytest
+
+from mracket import mutation
+from mracket.mutation import applier, mutator, reachability
+from mracket.reader import lexer, parser, syntax
+from mracket.runner import Runner, output
+
+
+def parse_expression(source: str) -> syntax.RacketExpressionNode:
+    return parser.Parser().parse_expression(lexer.Lexer().tokenize(source))
+
+
+@pytest.mark.parametrize(
+    "original_index,replacement_source,run",
+    [
+        # the body of f is never evaluated
+        [2, "2", False],
+        [2, "z", False],
+        # a name bound to a function is a syntax error outside of an operator in the teaching languages
+        [2, "g", True],
+        [2, "unbound-name", True],
+        [2, "(define y 1)", True],
+        [0, "2", False],
+        # an operator may name a special form, so replacing it may change how the program compiles
+        [1, "g", True],
+        # the body of g is evaluated by the test case
+        [3, "2", True],
+    ],
+)
+def test_run_mutants_skips_unreachable_mutants_that_compile(
+    monkeypatch: pytest.MonkeyPatch, original_index: int, replacement_source: str, run: bool
+) -> None:
+    source = "#lang racket\n(define (f x) (+ x 1))\n(define (g x) x)\n(define z 1)\n(check-expect (g 1) 1)"
+    program = parser.Parser().parse(lexer.Lexer().tokenize(source))
+    f_body = program.statements[0].expression.expression  # type: ignore[attr-defined]
+    g_body = program.statements[1].expression.expression  # type: ignore[attr-defined]
+    originals = [f_body, f_body.expressions[0], f_body.expressions[1], g_body]
+    mut = mutation.Mutation(originals[original_index], parse_expression(replacement_source), "")
+    mutants = applier.MutationApplier(program, [mut]).apply_mutations()
+
+    run_mutations = []
+
+    def run_mutant(mutant: mutation.Mutant) -> output.MutantOutput:
+        run_mutations.append(mutant.mutation)
+        return output.MutantOutput(mut=mutant.mutation, returncode=1)
+
+    monkeypatch.setattr(Runner, "run_mutant", staticmethod(run_mutant))
+    [mutant_output] = Runner.run_mutants(
+        mutants,
+        unreachable_nodes=reachability.unreachable_nodes(program),
+        defined_value_names=reachability.defined_value_names(program),
+        unmodified_stdout="unmodified",
+    )
+
+    assert mutant_output.mutation is mut
+    assert (run_mutations == [mut]) is run
+    if not run:
+        assert mutant_output.returncode == 0
+        assert mutant_output.stdout == "unmodified"
+
+
+@pytest.mark.parametrize("jobs", [0, -1])
+def test_runner_rejects_non_positive_jobs(jobs: int) -> None:
+    with pytest.raises(ValueError):
+        Runner(mutator.Mutator([]), "program.rkt", jobs)
@@ -31,6 +31,6 @@ def assert_mutants(generator: base.MutationGenerator, source: str, mutants: list
     program = parser.Parser().parse(lexer.Lexer().tokenize(f"#lang racket\n{source}"))
     mutator_ = mutator.Mutator(generators=[generator])
     for actual_mutant, expected_mutant in zip(
-        applier.MutationApplier(program, list(mutator_.generate_mutations(program))).visit(program), mutants
+        applier.MutationApplier(program, list(mutator_.generate_mutations(program))).apply_mutations(), mutants
     ):
         assert actual_mutant.source == f"#lang racket\n{expected_mutant}"